@@ -0,0 +1,31 @@
+#!/usr/bin/python3
+"""Benchmarks and load tests for the tienda API."""
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from models import Base
+# Import every model so all the tables are registered in the metadata
+from sellers import models as _sellers_models  # noqa: F401 pylint: disable=unused-import
+from shippers import models as _shippers_models  # noqa: F401 pylint: disable=unused-import
+from shipping import models as _shipping_models  # noqa: F401 pylint: disable=unused-import
+from products import models as _products_models  # noqa: F401 pylint: disable=unused-import
+
+
+def create_sqlite_engine():
+    """Create an in-memory SQLite engine with all the tables of the app.
+
+    The benchmarks that compare two implementations of the same query run
+    against this engine, so they don't need a MySQL server.
+    """
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def percentile(latencies: list[float], value: float) -> float:
+    """Return the percentile `value` (0-100) of the sorted `latencies`."""
+    index = max(int(len(latencies) * value / 100) - 1, 0)
+    return latencies[index]
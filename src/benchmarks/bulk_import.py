@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Benchmark of the bulk product import against the per-item path.
+
+Adds the same number of products with one `add_product` task per product
+and with a single `import_products` task, and reports the time of both.
+The products are added to the given shipping group, location and status,
+which must exist, with shipping labels starting with "bench-".
+
+Usage (from the ``src`` directory, with Redis, the workers and the database
+running):
+    python -m benchmarks.bulk_import --shipping-group g1 \\
+        --location store --status available --products 500
+"""
+import time
+import asyncio
+import argparse
+from dispatch import run_task
+from products import tasks
+
+
+def build_products(args, prefix):
+    """Build the products to be added"""
+    return [
+        {
+            "description": "benchmark product",
+            "shipping_label": f"bench-{prefix}-{i}",
+            "purchase_price": 10.0,
+            "product_location": args.location,
+            "product_status": args.status,
+            "shipping_group_name": args.shipping_group,
+        }
+        for i in range(args.products)
+    ]
+
+
+async def per_item(products):
+    """Add the products with one task per product"""
+    for product in products:
+        await run_task(tasks.add_product, **product)
+
+
+async def bulk(products):
+    """Add the products with a single import task"""
+    result = await run_task(tasks.import_products, products)
+    if result["errors"]:
+        raise ValueError(result["errors"][0]["message"])
+
+
+def main():
+    """Run the benchmark for both paths."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shipping-group", required=True)
+    parser.add_argument("--location", required=True)
+    parser.add_argument("--status", required=True)
+    parser.add_argument("--products", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'path':>10} {'products':>10} {'total s':>10} {'per item ms':>12}")
+    for name, add_products in (("per item", per_item), ("bulk", bulk)):
+        products = build_products(args, name.replace(" ", "-"))
+        start = time.perf_counter()
+        asyncio.run(add_products(products))
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name:>10} {len(products):>10} {elapsed:>10.2f} "
+            f"{elapsed / len(products) * 1000:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Benchmark of the list reads with ORM entities and with column rows.
+
+Reads all the sellers and all the shipping groups of a table with `rows`
+rows in two ways:
+
+- entities: `session.scalars(select(Model))`, then each schema is built
+  field by field from the attributes of the entity, as the list tasks did
+  before they were generated by `crud.Resource`.
+- columns: `crud.Resource.read_all`, which selects only the columns of the
+  schema as plain rows and validates them all at once, or not at all for
+  the trusted rows of the sellers (see benchmarks/row_serialization.py).
+
+It reports the CPU time (best of `--repeat` runs) and the peak of the
+memory allocated while reading, measured with tracemalloc in a separate run.
+
+Usage (from the ``src`` directory):
+    python -m benchmarks.list_reads --rows 100000
+"""
+import gc
+import time
+import argparse
+import tracemalloc
+from sqlalchemy import insert
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from shippers.models import Shipper
+from shipping.models import ShippingStatus
+from shipping.models import ShippingGroup
+from shipping.tasks import shipping_groups
+from sellers.models import Seller
+from sellers.tasks import sellers
+from . import create_sqlite_engine
+
+
+def seed(session, num_rows):
+    """Insert `num_rows` sellers and `num_rows` shipping groups"""
+    session.add_all([
+        Shipper(id_shipper=1, shipper_name="shipper"),
+        ShippingStatus(id_status=1, status_name="pending", description=""),
+    ])
+    session.execute(insert(Seller), [
+        {"seller_name": f"seller {i}"} for i in range(num_rows)
+    ])
+    session.execute(insert(ShippingGroup), [
+        {
+            "shipping_group_name": f"g{i}", "id_shipper": 1, "id_status": 1,
+            "shipping_cost": 100, "dollar_price": 17, "tax": 8,
+            "notes": "notes",
+        }
+        for i in range(num_rows)
+    ])
+    session.commit()
+
+
+def read_entities(session, resource):
+    """Read the rows as ORM entities and build the schemas field by field"""
+    return [
+        resource.schema(**{
+            field: getattr(entity, column.key)
+            for field, column in resource.columns.items()
+        }).model_dump()
+        for entity in session.scalars(select(resource.model)).all()
+    ]
+
+
+def read_columns(session, resource):
+    """Read only the columns of the schema, as the list tasks do"""
+    return resource.read_all(session)
+
+
+def measure_cpu(engine, read, resource, repeat):
+    """Return the best CPU time of `repeat` reads, in ms"""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        with Session(engine) as session:
+            start = time.process_time()
+            read(session, resource)
+            best = min(best, time.process_time() - start)
+    return best * 1000
+
+
+def measure_memory(engine, read, resource):
+    """Return the peak of the memory allocated by a read, in MB"""
+    gc.collect()
+    with Session(engine) as session:
+        tracemalloc.start()
+        read(session, resource)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = create_sqlite_engine()
+    with Session(engine) as session:
+        seed(session, args.rows)
+
+    print(f"{args.rows} rows\n")
+    print(f"{'table':>16} {'read':>10} {'cpu ms':>10} {'peak MB':>10}")
+    for resource in (sellers, shipping_groups):
+        for name, read in (
+                ("entities", read_entities),
+                ("columns", read_columns)):
+            cpu = measure_cpu(engine, read, resource, args.repeat)
+            memory = measure_memory(engine, read, resource)
+            print(
+                f"{resource.table:>16} {name:>10} "
+                f"{cpu:>10.0f} {memory:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Load test to measure the API throughput with concurrent requests.
+
+The test sends the same request from an increasing number of concurrent
+clients and reports the throughput reached at each level. With the task
+results awaited outside of the event loop, the throughput should grow with
+the number of requests in flight until the Celery workers are saturated.
+
+Usage (from the ``src`` directory, with the stack running):
+    python -m benchmarks.load_test --url http://localhost:8000/sellers/get-sellers
+"""
+import time
+import argparse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from . import percentile
+
+
+def _send_request(url: str) -> float:
+    """Send a request and return its latency in seconds."""
+    start = time.perf_counter()
+    with urllib.request.urlopen(url) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def run_level(url: str, concurrency: int, requests: int) -> dict:
+    """Send `requests` requests to `url` with `concurrency` clients."""
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        start = time.perf_counter()
+        latencies = sorted(executor.map(_send_request, [url] * requests))
+        elapsed = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "throughput": requests / elapsed,
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def main():
+    """Run the load test for every concurrency level."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    print(f"{'in flight':>10} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    for concurrency in args.concurrency:
+        stats = run_level(args.url, concurrency, args.requests)
+        print(
+            f"{stats['concurrency']:>10} {stats['throughput']:>10.1f} "
+            f"{stats['p50'] * 1000:>10.1f} {stats['p99'] * 1000:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
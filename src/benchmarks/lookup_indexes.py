@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark of the lookups by name with and without the unique indexes.
+
+Looks up random shipping groups by name and random products by shipping
+group and shipping label, in a database created with the unique indexes of
+the models and in one created without them. With the indexes the latency
+should stay flat regardless of the number of rows.
+
+Usage (from the ``src`` directory):
+    python -m benchmarks.lookup_indexes --sizes 1000 10000 100000
+"""
+import argparse
+from sqlalchemy import MetaData
+from sqlalchemy import UniqueConstraint
+from sqlalchemy import create_engine
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from models import Base
+from shipping.queries import select_shipping_group_by_name
+from products import models
+from . import create_sqlite_engine
+from . import percentile
+from .product_count import count_groups
+from .product_count import measure
+from .product_count import seed
+
+
+def create_sqlite_engine_without_indexes():
+    """Create an in-memory SQLite engine with the tables of the app, but
+    without their unique indexes, as they were before adding them."""
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        table = table.to_metadata(metadata)
+        table.constraints = {
+            constraint for constraint in table.constraints
+            if not isinstance(constraint, UniqueConstraint)
+        }
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    metadata.create_all(engine)
+    return engine
+
+
+def group_by_name(num_products):
+    """Return a query builder of shipping groups by name"""
+    num_groups = count_groups(num_products)
+    return lambda i: select_shipping_group_by_name(f"g{i % num_groups + 1}")
+
+
+def product_by_label(num_products):
+    """Return a query builder of products by shipping group and label"""
+    num_groups = count_groups(num_products)
+
+    def build_query(i):
+        index = i - 1
+        return select(models.Product).where(
+            models.Product.id_shipping_group == index % num_groups + 1,
+            models.Product.shipping_label == f"label{index}",
+        )
+    return build_query
+
+
+def main():
+    """Run the benchmark for every number of products."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    print(
+        f"{'products':>10} {'indexes':>8} {'lookup':>16} "
+        f"{'p50 ms':>10} {'p99 ms':>10}"
+    )
+    for size in args.sizes:
+        for indexes, create in (
+                ("no", create_sqlite_engine_without_indexes),
+                ("yes", create_sqlite_engine)):
+            with Session(create()) as session:
+                seed(session, size)
+                for name, build_query in (
+                        ("group by name", group_by_name(size)),
+                        ("product by label", product_by_label(size))):
+                    latencies = measure(
+                        session, build_query, size, args.iterations)
+                    print(
+                        f"{size:>10} {indexes:>8} {name:>16} "
+                        f"{percentile(latencies, 50) * 1000:>10.3f} "
+                        f"{percentile(latencies, 99) * 1000:>10.3f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
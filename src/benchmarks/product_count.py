@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Benchmark of single-product lookups as the catalog grows.
+
+Compares the product query that counts the products of every shipping group
+on each call with the one that reads the maintained `product_count` column.
+With the maintained count the latency should stay flat regardless of the
+number of products.
+
+Usage (from the ``src`` directory):
+    python -m benchmarks.product_count --sizes 1000 10000 100000
+"""
+import time
+import argparse
+from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from shippers.models import Shipper
+from shipping.models import ShippingGroup
+from shipping.models import ShippingStatus
+from products import models
+from products import queries
+from . import create_sqlite_engine
+from . import percentile
+
+GROUP_SIZE = 100
+
+
+def counted_product_query(product_id):
+    """Product query counting the products per shipping group on each call.
+
+    This is how the purchase price was computed before the count was
+    maintained in the shipping_groups table.
+    """
+    product_count = select(
+        models.Product.id_shipping_group,
+        func.count(models.Product.id_product).label('product_count'),  # pylint: disable=not-callable
+    ).group_by(models.Product.id_shipping_group).subquery()
+    shipping_cost = ShippingGroup.shipping_cost / product_count.c.product_count
+    return (
+        select(
+            models.Product.id_product,
+            func.round(
+                models.Product.purchase_price * ShippingGroup.dollar_price +
+                shipping_cost * ShippingGroup.dollar_price, 2),
+        )
+        .join(ShippingGroup, models.Product.id_shipping_group == ShippingGroup.id_shipping_group)
+        .join(product_count, models.Product.id_shipping_group == product_count.c.id_shipping_group)
+        .where(models.Product.id_product == product_id)
+    )
+
+
+def count_groups(num_products):
+    """Return the number of shipping groups of `num_products` products"""
+    return max(1, num_products // GROUP_SIZE)
+
+
+def seed(session, num_products):
+    """Insert `num_products` products split in groups of GROUP_SIZE."""
+    session.add_all([
+        Shipper(id_shipper=1, shipper_name="shipper"),
+        ShippingStatus(id_status=1, status_name="pending", description=""),
+        models.ProductStatus(id_product_status=1, status_name="available"),
+        models.Location(id_location=1, location_name="store"),
+    ])
+    num_groups = count_groups(num_products)
+    session.execute(insert(ShippingGroup), [
+        {
+            "id_shipping_group": group, "shipping_group_name": f"g{group}",
+            "id_shipper": 1, "id_status": 1, "shipping_cost": 100,
+            "dollar_price": 17, "tax": 8,
+            # The products are assigned to the groups in turn
+            "product_count": (
+                num_products // num_groups
+                + (group <= num_products % num_groups)),
+        }
+        for group in range(1, num_groups + 1)
+    ])
+    session.execute(insert(models.Product), [
+        {
+            "description": "product", "shipping_label": f"label{i}",
+            "purchase_price": 40, "sale_price": 1200, "id_product_status": 1,
+            "id_location": 1, "id_shipping_group": i % num_groups + 1,
+        }
+        for i in range(num_products)
+    ])
+    session.commit()
+
+
+def measure(session, build_query, num_products, iterations):
+    """Return the sorted latencies of looking up random products."""
+    latencies = []
+    for i in range(iterations):
+        query = build_query((i * 7919) % num_products + 1)
+        start = time.perf_counter()
+        session.execute(query).first()
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def main():
+    """Run the benchmark for every catalog size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'products':>10} {'query':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    for size in args.sizes:
+        with Session(create_sqlite_engine()) as session:
+            seed(session, size)
+            for name, build_query in (
+                    ("counted", counted_product_query),
+                    ("maintained", queries.get_product_query)):
+                latencies = measure(session, build_query, size, args.iterations)
+                print(
+                    f"{size:>10} {name:>10} "
+                    f"{percentile(latencies, 50) * 1000:>10.2f} "
+                    f"{percentile(latencies, 99) * 1000:>10.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
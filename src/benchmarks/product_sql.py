@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""Dump the SQL of the product query and check the formulas in it.
+
+Prints the SQL generated for MySQL and how many times the purchase price
+formula appears in it, which should be exactly once.
+
+Usage (from the ``src`` directory):
+    python -m benchmarks.product_sql
+"""
+from products import queries
+
+
+def main():
+    """Print the SQL of the product query."""
+    sql = queries.dump_sql(queries.get_product_query())
+    print(sql)
+    print()
+    print(f"purchase_price_mxn formula: {sql.count('product_count')} time(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Benchmark to compare the latency of the read execution modes.
+
+The same lookup task is executed through Celery (broker, worker and result
+backend) and directly in this process with the local database session, and
+the p50/p99 latencies of both modes are reported.
+
+Usage (from the ``src`` directory, with Redis, the workers and the database
+running):
+    python -m benchmarks.read_modes --iterations 500
+"""
+import time
+import asyncio
+import argparse
+import dispatch
+from sellers import tasks
+from . import percentile
+
+
+async def measure(mode: str, iterations: int) -> list[float]:
+    """Return the sorted latencies of `iterations` reads in `mode`."""
+    dispatch.READ_MODE = mode
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await dispatch.run_read(tasks.get_sellers)
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def main():
+    """Run the benchmark for both execution modes."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'mode':>8} {'p50 ms':>10} {'p99 ms':>10}")
+    for mode in ("celery", "local"):
+        latencies = asyncio.run(measure(mode, args.iterations))
+        p50 = percentile(latencies, 50)
+        p99 = percentile(latencies, 99)
+        print(f"{mode:>8} {p50 * 1000:>10.2f} {p99 * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Benchmark of the serialization of a large `get_products` result.
+
+Builds a result like the one returned by the `get_products` task and
+reports, for each payload format, its size and the time to encode it (in
+the worker) and decode it (in the API):
+
+- json: the default result serializer of Celery.
+- msgpack-compact: the serializer of serializers.py.
+- columnar json / msgpack-compact: the products as a list of columns and
+  rows of values, instead of one dictionary per product.
+
+It also compares the response of a route that returns the result, which
+FastAPI validates against the response model and serializes with
+`jsonable_encoder`, with the trusted passthrough of dispatch.py. Both are
+measured with a full request through a TestClient.
+
+Usage (from the ``src`` directory):
+    python -m benchmarks.result_serialization --products 50000
+"""
+import time
+import argparse
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from kombu.serialization import dumps
+from kombu.serialization import loads
+from dispatch import trusted_response
+import serializers
+from products import schemas
+
+
+def build_result(num_products):
+    """Build a `get_products` result with `num_products` products"""
+    products = [
+        schemas.ProductDetailResponse(
+            id_product=i,
+            description=f"product {i}",
+            shipping_label=f"label-{i}",
+            purchase_price=12.5,
+            shipping_group=f"group-{i // 100}",
+            status="available",
+            location_name="store",
+            purchase_price_mxn=231.87,
+            sale_price=350.0,
+            profit=118.13,
+        ).model_dump()
+        for i in range(num_products)
+    ]
+    return schemas.GetProductsDetailResponse(
+        products=products,
+        num_products=len(products),
+    ).model_dump()
+
+
+def to_columns(result):
+    """Convert the products of a result to columns and rows of values"""
+    columns = list(result["products"][0])
+    return {
+        **result,
+        "products": {
+            "columns": columns,
+            "rows": [
+                [product[column] for column in columns]
+                for product in result["products"]
+            ],
+        },
+    }
+
+
+def measure(function, repeat):
+    """Return the best time of `repeat` calls of `function`, in ms"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def benchmark_serializers(result, repeat):
+    """Report size and encode/decode times of every payload format"""
+    payloads = (
+        ("json", "json", result),
+        (serializers.SERIALIZER_NAME, serializers.SERIALIZER_NAME, result),
+        ("columnar json", "json", to_columns(result)),
+        (f"columnar {serializers.SERIALIZER_NAME}",
+         serializers.SERIALIZER_NAME, to_columns(result)),
+    )
+    print(f"{'format':>24} {'size KB':>10} {'encode ms':>10} {'decode ms':>10}")
+    for name, serializer, payload in payloads:
+        content_type, encoding, data = dumps(payload, serializer=serializer)
+        encode = measure(lambda: dumps(payload, serializer=serializer), repeat)  # pylint: disable=cell-var-from-loop
+        decode = measure(lambda: loads(data, content_type, encoding), repeat)  # pylint: disable=cell-var-from-loop
+        print(f"{name:>24} {len(data) / 1024:>10.0f} {encode:>10.1f} {decode:>10.1f}")
+
+
+def build_app(result):
+    """Build an app with a route per response path, like products/router"""
+    app = FastAPI()
+
+    @app.get("/validated")
+    async def validated() -> schemas.GetProductsDetailResponse:
+        return result
+
+    @app.get("/trusted")
+    async def trusted() -> schemas.GetProductsDetailResponse:
+        return trusted_response(result)
+
+    return app
+
+
+def benchmark_response(result, repeat):
+    """Report the time of a request of the response validated or trusted"""
+    with TestClient(build_app(result)) as client:
+        print(f"\n{'response':>24} {'ms':>10}")
+        for path in ("validated", "trusted"):
+            elapsed = measure(lambda: client.get(f"/{path}"), repeat)  # pylint: disable=cell-var-from-loop
+            print(f"{path:>24} {elapsed:>10.1f}")
+
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    result = build_result(args.products)
+    print(f"{args.products} products\n")
+    benchmark_serializers(result, args.repeat)
+    benchmark_response(result, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
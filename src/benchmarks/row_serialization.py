@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Benchmark of the serialization of the rows read by the tasks.
+
+The rows are read once, and only their conversion to the dictionaries
+returned by the tasks is measured, per row:
+
+- products: a page of `get_products`. Before, each product was built field
+  by field and validated again as an item of GetProductsDetailResponse.
+  After, `build_products_response` validates all of them in one pass.
+- sellers and shipping_groups: the rows of the list tasks. Before, each
+  schema was built field by field. After, `crud.Resource.dump_rows`
+  validates the whole list with a TypeAdapter, or returns the trusted rows
+  of the sellers without validating them.
+
+Usage (from the ``src`` directory):
+    python -m benchmarks.row_serialization --rows 100000
+"""
+import time
+import argparse
+from sqlalchemy.orm import Session
+import crud
+from products import schemas
+from products import queries
+from products.tasks import build_products_response
+from sellers.tasks import sellers
+from shipping.tasks import shipping_groups
+from . import create_sqlite_engine
+from . import list_reads
+from . import product_count
+
+
+def products_before(keys, rows):
+    """Build each product field by field, then the response"""
+    del keys
+    products = [
+        schemas.ProductDetailResponse(
+            id_product=row.id_product,
+            description=row.description,
+            shipping_label=row.shipping_label,
+            purchase_price=row.purchase_price,
+            shipping_group=row.shipping_group_name,
+            status=row.status_name,
+            location_name=row.location_name,
+            purchase_price_mxn=row.purchase_price_mxn,
+            sale_price=row.sale_price,
+            profit=row.profit,
+        ).model_dump()
+        for row in rows
+    ]
+    return schemas.GetProductsDetailResponse(
+        products=products,
+        num_products=len(products),
+    ).model_dump()
+
+
+def products_after(keys, rows):
+    """Validate all the products in one pass"""
+    return build_products_response(crud.rows_as_dicts(keys, rows))
+
+
+def resource_before(resource):
+    """Build each schema of a resource field by field"""
+    def dump(keys, rows):
+        del keys
+        return [
+            resource.schema(**{
+                field: getattr(row, field) for field in resource.columns
+            }).model_dump()
+            for row in rows
+        ]
+    return dump
+
+
+def measure(function, keys, rows, repeat):
+    """Return the best time per row of `repeat` calls, in microseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(keys, rows)
+        best = min(best, time.perf_counter() - start)
+    return best / len(rows) * 1e6
+
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with Session(create_sqlite_engine()) as session:
+        product_count.seed(session, args.rows)
+        result = session.execute(queries.get_product_query())
+        cases = [(
+            "products", result.keys(), result.all(),
+            products_before, products_after,
+        )]
+    with Session(create_sqlite_engine()) as session:
+        list_reads.seed(session, args.rows)
+        for resource in (sellers, shipping_groups):
+            result = session.execute(resource.query)
+            cases.append((
+                resource.table, result.keys(), result.all(),
+                resource_before(resource),
+                lambda keys, rows, resource=resource: resource.dump_rows(rows),
+            ))
+
+    print(f"{args.rows} rows\n")
+    print(f"{'rows':>16} {'before us':>10} {'after us':>10}")
+    for name, keys, rows, before, after in cases:
+        print(
+            f"{name:>16} "
+            f"{measure(before, keys, rows, args.repeat):>10.2f} "
+            f"{measure(after, keys, rows, args.repeat):>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
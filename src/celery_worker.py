@@ -1,11 +1,28 @@
 #!/usr/bin/env python
 """Celery worker module."""
+import os
+import json
+import time
+import socket
+import logging
+import threading
+import redis
 from celery import Celery
+from celery.signals import celeryd_init
+from celery.signals import worker_process_init
+from database import engine
+from database import get_pool_stats
+import serializers
+
+logger = logging.getLogger(__name__)
+
+# Redis instance used as broker and result backend, and shared by the caches
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis/0")
 
 celery_app = Celery(
     "tasks",
-    broker="redis://redis/0",
-    backend="redis://redis/0",
+    broker=REDIS_URL,
+    backend=REDIS_URL,
     include=[
         "sellers.tasks",
         "shippers.tasks",
@@ -14,9 +31,87 @@ celery_app = Celery(
     ],
 )
 
-celery_app.conf.task_routes = {
-    "sellers.tasks.*": {"queue": "base"},
-    "shippers.tasks.*": {"queue": "base"},
-    "shipping.tasks.*": {"queue": "base"},
-    "products.tasks.*": {"queue": "base"},
-}
+# Serializer of the task results: "json", or "msgpack-compact" for smaller
+# payloads that are faster to encode and decode (see serializers.py)
+RESULT_SERIALIZER = os.getenv("TASK_RESULT_SERIALIZER", "json")
+celery_app.conf.result_serializer = RESULT_SERIALIZER
+celery_app.conf.result_accept_content = ["json", serializers.SERIALIZER_NAME]
+
+# The connection pools of the workers are in their child processes, so each
+# child pushes its pool statistics to a key of its own every
+# DB_POOL_STATS_INTERVAL seconds, which are read by GET /metrics/db-pool.
+# The key expires if the process stops pushing.
+POOL_STATS_KEY = "tienda:db-pool"
+POOL_STATS_INTERVAL = float(os.getenv("DB_POOL_STATS_INTERVAL", "10"))
+
+# Seconds the task results are kept in the backend. The results read by the
+# routers are removed right away (see dispatch.run_task).
+celery_app.conf.result_expires = int(os.getenv("TASK_RESULT_EXPIRES", "3600"))
+
+# Store the STARTED state, so it is pushed to the task websockets
+celery_app.conf.task_track_started = True
+
+# Tasks are routed to a queue per workload, so each queue can be consumed
+# by its own workers: fast lookups are never stuck behind slow jobs. The
+# patterns are matched in order and the first match wins.
+celery_app.conf.task_routes = ([
+    # Long jobs
+    ("sellers.tasks.add", {"queue": "bulk"}),
+    ("products.tasks.import_products", {"queue": "bulk"}),
+    ("products.tasks.add_sale_prices", {"queue": "bulk"}),
+    ("products.tasks.delete_products", {"queue": "bulk"}),
+    ("products.tasks.delete_product_statuses", {"queue": "bulk"}),
+    ("products.tasks.delete_locations", {"queue": "bulk"}),
+    ("sellers.tasks.delete_sellers", {"queue": "bulk"}),
+    ("shippers.tasks.delete_shippers", {"queue": "bulk"}),
+    ("shipping.tasks.delete_shipping_statuses", {"queue": "bulk"}),
+    ("shipping.tasks.delete_shipping_groups", {"queue": "bulk"}),
+    # Lookups and listings
+    ("*.tasks.get_*", {"queue": "reads"}),
+    # Everything else changes the database
+    ("*", {"queue": "writes"}),
+],)
+
+
+@worker_process_init.connect
+def reset_db_pool(**_):
+    """Give every prefork child process its own connection pool.
+
+    The engine is created when the module is imported by the parent process,
+    so the children must not reuse the connections inherited from it. Each
+    child also starts pushing the statistics of its pool.
+    """
+    engine.dispose(close=False)
+    threading.Thread(
+        target=_push_pool_stats,
+        name="pool-stats-pusher",
+        daemon=True,
+    ).start()
+
+
+# Name of the worker node, e.g. "reads@host", set before forking the children
+_worker = {"nodename": socket.gethostname()}
+
+
+@celeryd_init.connect
+def set_nodename(sender=None, **_):
+    """Keep the name of the worker node, to label its pool statistics."""
+    _worker["nodename"] = sender
+
+
+def _push_pool_stats():
+    """Push the pool statistics of this process to Redis periodically."""
+    client = redis.Redis.from_url(REDIS_URL)
+    key = f"{POOL_STATS_KEY}:{_worker['nodename']}:{os.getpid()}"
+    while True:
+        stats = {
+            "hostname": _worker["nodename"],
+            "pid": os.getpid(),
+            "engine": get_pool_stats(engine),
+        }
+        try:
+            client.set(
+                key, json.dumps(stats), px=int(POOL_STATS_INTERVAL * 3000))
+        except redis.RedisError as exc:
+            logger.warning("Could not push the pool statistics: %s", exc)
+        time.sleep(POOL_STATS_INTERVAL)
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""Database operations shared by the tasks of every app.
+
+The rows are deleted with DELETE statements filtered by their primary key,
+so they are never loaded in the session before deleting them. The helpers
+don't commit, so they can be combined with other changes in the same
+transaction.
+
+`Resource` generates the CRUD tasks of the models that are simple lists of
+names, such as the statuses, the locations, the sellers and the shippers.
+Their routes are added with `crud_router.Routes`.
+"""
+from celery import shared_task
+from pydantic import TypeAdapter
+from sqlalchemy import delete
+from sqlalchemy import insert
+from sqlalchemy import inspect
+from sqlalchemy import select
+from sqlalchemy import update
+from database import Session
+from database import execute_unique
+import reference_cache
+import response_cache
+from schemas import BulkDeleteResponse
+
+
+def _get_primary_key(model):
+    """Return the primary key column of a model"""
+    return inspect(model).primary_key[0]
+
+
+def delete_by_id(session, model, row_id: int, name: str):
+    """Delete a row by its primary key in a single DELETE statement.
+
+    The affected row count tells whether the row existed.
+
+    Args:
+        session: The session to execute the statement.
+        model: Model class of the row.
+        row_id (int): Primary key of the row.
+        name (str): Name of the model in the error message.
+
+    Raises:
+        ValueError: If there is no row with the given ID.
+    """
+    primary_key = _get_primary_key(model)
+    result = session.execute(
+        delete(model)
+        .where(primary_key == row_id)
+        .execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:
+        raise ValueError(f"{name} with ID {row_id} not found.")
+
+
+def delete_by_ids(session, model, ids: list[int]) -> BulkDeleteResponse:
+    """Delete many rows by their primary keys.
+
+    The IDs that exist are read in one query, so they can be reported
+    without loading the rows, and all of them are deleted in one DELETE
+    statement.
+
+    Args:
+        session: The session to execute the statements.
+        model: Model class of the rows.
+        ids (list[int]): Primary keys of the rows.
+
+    Returns:
+        BulkDeleteResponse: The number of deleted rows and the IDs that were
+            not found.
+    """
+    primary_key = _get_primary_key(model)
+    found_ids = set(session.scalars(
+        select(primary_key).where(primary_key.in_(set(ids)))
+    ).all())
+    if found_ids:
+        session.execute(
+            delete(model)
+            .where(primary_key.in_(found_ids))
+            .execution_options(synchronize_session=False)
+        )
+    return BulkDeleteResponse(
+        num_deleted=len(found_ids),
+        not_found=[
+            row_id for row_id in dict.fromkeys(ids)
+            if row_id not in found_ids
+        ],
+    )
+
+
+def rows_as_dicts(keys, rows) -> list[dict]:
+    """Return the rows of a query as dictionaries of their columns.
+
+    Validating a list of plain dictionaries in one pass is faster than
+    validating each Row by its attributes (see
+    benchmarks/row_serialization.py).
+
+    Args:
+        keys: Names of the columns, e.g. `result.keys()`.
+        rows: The rows of the query.
+    """
+    keys = list(keys)
+    return [dict(zip(keys, row)) for row in rows]
+
+
+# The settings of the model and the query, schema adapter and tasks built
+# from them are all read by the generated tasks and routes
+class Resource:  # pylint: disable=too-many-instance-attributes
+    """Generator of the CRUD tasks of a model.
+
+    The fields of the schema are read from the columns of the same name, or
+    from the ones given in `columns`, so the tasks select only those
+    columns, and the rows of a list are validated all at once with a
+    TypeAdapter instead of building each schema. The changes are made with single
+    INSERT, UPDATE and DELETE statements, and clear the reference cache and
+    the cached responses of the table.
+
+    The tasks are registered in Celery with the name of the module that
+    creates them, e.g. `get_sellers = sellers.get_all_task("get_sellers",
+    "sellers")` in sellers/tasks.py is the task `sellers.tasks.get_sellers`.
+
+    Args:
+        model: Model class of the rows.
+        schema: Schema of a row.
+        name (str): Name of the model in the error messages, e.g. "Seller".
+        module (str): Name of the module of the tasks, usually `__name__`.
+        columns (dict): Columns of the schema fields whose name is not the
+            same as the column, e.g. `{"id": models.Seller.id_seller}`.
+        fields (tuple): Fields that are set when a row is added or updated.
+        trusted (bool): The columns already have the types of the schema,
+            e.g. no Numeric column that must be converted to float, so the
+            rows are returned without validating them.
+    """
+
+    def __init__(
+            self,
+            model,
+            schema,
+            name: str,
+            module: str,
+            columns: dict | None = None,
+            fields: tuple[str, ...] = ("name",),
+            trusted: bool = False,
+    ):
+        self.model = model
+        self.schema = schema
+        self.name = name
+        self.module = module
+        self.fields = fields
+        self.trusted = trusted
+        self.table = model.__tablename__
+        self.primary_key = _get_primary_key(model)
+        columns = columns or {}
+        self.columns = {
+            field: columns[field] if field in columns else getattr(model, field)
+            for field in schema.model_fields
+        }
+        self.query = select(*[
+            column.label(field) for field, column in self.columns.items()
+        ])
+        self.adapter = TypeAdapter(list[schema])
+        # Generated tasks by operation, used to add their routes
+        self.tasks = {}
+
+    def _register(self, operation: str, name: str, function, doc: str):
+        """Register a generated function as a Celery task"""
+        function.__name__ = function.__qualname__ = name
+        function.__module__ = self.module
+        function.__doc__ = doc
+        task = shared_task(name=f"{self.module}.{name}")(function)
+        self.tasks[operation] = task
+        return task
+
+    def dump_rows(self, rows) -> list[dict]:
+        """Return selected rows as dictionaries of the schema"""
+        rows = rows_as_dicts(self.columns, rows)
+        if self.trusted:
+            return rows
+        return self.adapter.dump_python(self.adapter.validate_python(rows))
+
+    def _not_found(self, row_id: int) -> ValueError:
+        """Return the error of a missing row"""
+        return ValueError(f"{self.name} with ID {row_id} not found.")
+
+    def _duplicated(self, values: dict) -> str:
+        """Return the error message of a duplicated name"""
+        return f"{self.name} '{values.get('name')}' already exists in the database."
+
+    def _values(self, values: dict) -> dict:
+        """Return the values of the fields by column"""
+        return {self.columns[field]: values[field] for field in self.fields}
+
+    def _invalidate(self):
+        """Clear the cached rows and responses of the table"""
+        reference_cache.invalidate(self.table)
+        response_cache.invalidate(self.table)
+
+    def read_all(self, session) -> list[dict]:
+        """Return all the rows as dictionaries of the schema.
+
+        Only the columns of the schema are selected, as plain rows, so no
+        ORM instance is built or tracked by the session (see
+        benchmarks/list_reads.py).
+        """
+        return self.dump_rows(session.execute(self.query))
+
+    def get_all_task(self, name: str, key: str):
+        """Generate the task that returns all the rows under `key`"""
+        def get_all():
+            with Session() as session:
+                return {key: self.read_all(session)}
+
+        return self._register(
+            "get_all", name, get_all, f"Get all the {self.table} from database")
+
+    def get_one_task(self, name: str):
+        """Generate the task that returns a row by ID"""
+        def load(row_id: int):
+            with Session() as session:
+                row = session.execute(
+                    self.query.where(self.primary_key == row_id)
+                ).first()
+                if row is None:
+                    raise self._not_found(row_id)
+                return self.dump_rows([row])[0]
+
+        def get_one(row_id: int):
+            return reference_cache.get_or_load(
+                self.table,
+                ("id", row_id),
+                lambda: load(row_id),
+            )
+
+        return self._register(
+            "get_one", name, get_one,
+            f"Get {self.name} from the reference cache or database")
+
+    def add_task(self, name: str, response=None):
+        """Generate the task that adds a row and returns its ID
+
+        Args:
+            name (str): Name of the task.
+            response: Schema of the response with the `id` of the row,
+                the ID is returned as is if not given.
+        """
+        def add(**values):
+            with Session() as session:
+                result = execute_unique(
+                    session,
+                    insert(self.model).values(self._values(values)),
+                    self._duplicated(values),
+                )
+                session.commit()
+                row_id = result.inserted_primary_key[0]
+            self._invalidate()
+            if response is not None:
+                return response(id=row_id).model_dump()
+            return row_id
+
+        return self._register("add", name, add, f"Add {self.name} to database")
+
+    def update_task(self, name: str):
+        """Generate the task that updates the fields of a row by ID"""
+        def update_one(row_id: int, **values):
+            with Session() as session:
+                result = execute_unique(
+                    session,
+                    update(self.model)
+                    .where(self.primary_key == row_id)
+                    .values(self._values(values))
+                    .execution_options(synchronize_session=False),
+                    self._duplicated(values),
+                )
+                if not result.rowcount:
+                    raise self._not_found(row_id)
+                session.commit()
+            self._invalidate()
+            return row_id
+
+        return self._register(
+            "update", name, update_one, f"Update {self.name} by ID")
+
+    def delete_task(self, name: str):
+        """Generate the task that deletes a row by ID"""
+        def delete_one(row_id: int):
+            with Session() as session:
+                delete_by_id(session, self.model, row_id, self.name)
+                session.commit()
+            self._invalidate()
+            return row_id
+
+        return self._register(
+            "delete", name, delete_one, f"Delete {self.name} by ID")
+
+    def delete_many_task(self, name: str):
+        """Generate the task that deletes many rows by their IDs"""
+        def delete_many(row_ids: list[int]):
+            with Session() as session:
+                response = delete_by_ids(session, self.model, row_ids)
+                session.commit()
+            self._invalidate()
+            return response.model_dump()
+
+        return self._register(
+            "delete_many", name, delete_many,
+            f"Delete many {self.table} by their IDs")
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Routes of the CRUD tasks generated by `crud.Resource`.
+
+The endpoints are built with an explicit signature, so FastAPI sees the
+same path and query parameters as in a hand-written endpoint, and the
+URLs, parameters and response models of the existing routes are kept.
+"""
+import re
+import inspect
+from fastapi import APIRouter
+from dispatch import run_task
+from dispatch import run_read
+from dispatch import BULK_TIMEOUT
+import response_cache
+from schemas import BulkDeleteResponse
+
+
+def _get_path_parameter(path: str) -> str:
+    """Return the name of the ID parameter of a path, e.g. `seller_id`"""
+    return re.search(r"\{(\w+)\}", path).group(1)
+
+
+def _parameter(name: str, annotation) -> inspect.Parameter:
+    """Return a required keyword parameter of an endpoint"""
+    return inspect.Parameter(
+        name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation)
+
+
+class Routes:
+    """Adds the routes of the tasks of a `crud.Resource` to a router.
+
+    Args:
+        router (APIRouter): The router of the app.
+        module (str): Name of the module of the router, usually `__name__`.
+            The endpoints are named after it, e.g. in the metrics of the
+            response cache.
+    """
+
+    def __init__(self, router: APIRouter, module: str):
+        self.router = router
+        self.module = module
+
+    def _add_route(
+            self,
+            method: str,
+            path: str,
+            call,
+            name: str,
+            doc: str,
+            parameters: list[inspect.Parameter],
+            response_model,
+            cache_tags: tuple[str, ...] = (),
+            **options,
+    ):
+        """Add an endpoint that awaits `call` with its parameters"""
+        async def endpoint(**params):
+            return await call(**params)
+
+        endpoint.__name__ = endpoint.__qualname__ = name
+        endpoint.__module__ = self.module
+        endpoint.__doc__ = doc
+        endpoint.__signature__ = inspect.Signature(
+            parameters, return_annotation=response_model)
+        if cache_tags:
+            endpoint = response_cache.cached(*cache_tags)(endpoint)
+        self.router.add_api_route(path, endpoint, methods=[method], **options)
+
+    @staticmethod
+    def _task_name(task) -> str:
+        """Return the name of a task without its module"""
+        return task.name.rsplit(".", 1)[-1]
+
+    def _field_parameters(self, resource) -> list[inspect.Parameter]:
+        """Return the query parameters of the fields of a resource"""
+        return [
+            _parameter(field, resource.schema.model_fields[field].annotation)
+            for field in resource.fields
+        ]
+
+    def get_all(self, resource, path: str, response_model, doc: str,
+                name: str | None = None, cache: bool = False, **options):
+        """Add the route of the task that gets all the rows
+
+        Args:
+            cache (bool): Cache the response with `response_cache`, tagged
+                with the table of the resource.
+            **options: Options of the route, e.g. `dependencies`.
+        """
+        task = resource.tasks["get_all"]
+        self._add_route(
+            "GET", path,
+            lambda: run_read(task),
+            name or self._task_name(task), doc, [], response_model,
+            cache_tags=(resource.table,) if cache else (),
+            **options,
+        )
+
+    def get_one(self, resource, path: str, response_model, doc: str,
+                name: str | None = None, **options):
+        """Add the route of the task that gets a row by ID"""
+        task = resource.tasks["get_one"]
+        id_name = _get_path_parameter(path)
+        self._add_route(
+            "GET", path,
+            lambda **params: run_read(task, params[id_name]),
+            name or self._task_name(task), doc,
+            [_parameter(id_name, int)], response_model,
+            **options,
+        )
+
+    def add(self, resource, path: str, response_model, doc: str,
+            name: str | None = None, method: str = "POST", **options):
+        """Add the route of the task that adds a row"""
+        task = resource.tasks["add"]
+        self._add_route(
+            method, path,
+            lambda **params: run_task(task, **params),
+            name or self._task_name(task), doc,
+            self._field_parameters(resource), response_model,
+            **options,
+        )
+
+    def update(self, resource, path: str, response_model, doc: str,
+               name: str | None = None, **options):
+        """Add the route of the task that updates a row by ID"""
+        task = resource.tasks["update"]
+        id_name = _get_path_parameter(path)
+
+        def call(**params):
+            return run_task(task, params.pop(id_name), **params)
+
+        self._add_route(
+            "PUT", path, call,
+            name or self._task_name(task), doc,
+            [_parameter(id_name, int), *self._field_parameters(resource)],
+            response_model,
+            **options,
+        )
+
+    def delete(self, resource, path: str, response_model, doc: str,
+               name: str | None = None, **options):
+        """Add the route of the task that deletes a row by ID"""
+        task = resource.tasks["delete"]
+        id_name = _get_path_parameter(path)
+        self._add_route(
+            "DELETE", path,
+            lambda **params: run_task(task, params[id_name]),
+            name or self._task_name(task), doc,
+            [_parameter(id_name, int)], response_model,
+            **options,
+        )
+
+    def delete_many(self, resource, path: str, doc: str,
+                    name: str | None = None, **options):
+        """Add the route of the task that deletes many rows by their IDs
+
+        The body of the request is the list of IDs.
+        """
+        task = resource.tasks["delete_many"]
+        self._add_route(
+            "POST", path,
+            lambda **params: run_task(
+                task, params["ids"], timeout=BULK_TIMEOUT),
+            name or self._task_name(task), doc,
+            [_parameter("ids", list[int])], BulkDeleteResponse,
+            **options,
+        )
@@ -1,23 +1,204 @@
 #!\usr\bin\env python3
 """Module to handle database operations."""
 import os
+import time
+import threading
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm import scoped_session
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
 load_dotenv()
 
 
-def _get_db_url():
-    """Return the database URL."""
+def _get_db_url(driver="mysqlconnector"):
+    """Return the database URL for the given MySQL driver."""
     db_host = os.getenv('DB_HOST')
     db_user = os.getenv('DB_USER')
     db_port = os.getenv('DB_PORT')
     db_pass = os.getenv('DB_PASS')
     db_name = os.getenv('DB_NAME')
-    return f"mysql+mysqlconnector://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}"
+    return f"mysql+{driver}://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}"
 
 
-engine = create_engine(_get_db_url(), pool_pre_ping=True, pool_recycle=3600)
+def _get_pool_options():
+    """Return the connection pool options.
+
+    The options are read from the same environment (or .env file) as the
+    database URL, so the pools can be sized per deployment, e.g. a small pool
+    for every Celery child process and a bigger one for the API.
+    """
+    return {
+        "pool_size": int(os.getenv('DB_POOL_SIZE', '5')),
+        "max_overflow": int(os.getenv('DB_MAX_OVERFLOW', '10')),
+        "pool_timeout": float(os.getenv('DB_POOL_TIMEOUT', '30')),
+        "pool_recycle": int(os.getenv('DB_POOL_RECYCLE', '3600')),
+        "pool_pre_ping": os.getenv('DB_POOL_PRE_PING', 'true').lower() in (
+            'true', '1', 'yes'),
+    }
+
+
+class PoolMetrics:
+    """Checkout statistics of a connection pool.
+
+    A checkout is counted as a wait when the pool had no idle connection
+    and no overflow left, i.e. the caller was queued until another one
+    returned its connection.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_time = 0.0
+        self.max_checkout_time = 0.0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+
+    def record(self, elapsed: float, waited: bool, timed_out: bool = False):
+        """Record a checkout that took `elapsed` seconds."""
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.checkout_time += elapsed
+            self.max_checkout_time = max(self.max_checkout_time, elapsed)
+            if waited:
+                self.waits += 1
+                self.wait_time += elapsed
+
+    def as_dict(self) -> dict:
+        """Return the statistics as a dictionary."""
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "avg_checkout_ms": (
+                    self.checkout_time / self.checkouts * 1000
+                    if self.checkouts else 0.0),
+                "max_checkout_ms": self.max_checkout_time * 1000,
+                "waits": self.waits,
+                "wait_time_ms": self.wait_time * 1000,
+                "timeouts": self.timeouts,
+            }
+
+
+class _MeteredPoolMixin:
+    """Mixin that records the checkout latency of a QueuePool."""
+
+    metrics: PoolMetrics
+
+    def connect(self):
+        """Checkout a connection and record how long it took."""
+        # pylint: disable=protected-access
+        waited = (
+            self.checkedin() == 0
+            and self.overflow() >= self._max_overflow
+        )
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record(time.perf_counter() - start, waited, True)
+            raise
+        self.metrics.record(time.perf_counter() - start, waited)
+        return connection
+
+
+class MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+    """QueuePool of the sync engine, with checkout metrics."""
+
+    metrics = PoolMetrics()
+
+
+class MeteredAsyncQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    """QueuePool of the async engine, with checkout metrics."""
+
+    metrics = PoolMetrics()
+
+
+def get_pool_stats(db_engine) -> dict:
+    """Return the current state and the checkout metrics of an engine pool."""
+    pool = db_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        **pool.metrics.as_dict(),
+    }
+
+
+# MySQL error code of a duplicated value in a unique index
+ER_DUP_ENTRY = 1062
+
+
+def _raise_duplicated(session, error, message: str):
+    """Rollback and raise ValueError if `error` is a duplicated value"""
+    session.rollback()
+    if getattr(error.orig, "errno", None) != ER_DUP_ENTRY:
+        raise error
+    raise ValueError(message) from error
+
+
+def commit_unique(session, message: str):
+    """Commit the session, raising ValueError if a unique index is violated.
+
+    The unique indexes enforce the names that must not be repeated, so the
+    tasks don't need to look for a duplicate before every insert or rename.
+
+    Args:
+        session: The session to commit.
+        message (str): Message of the ValueError.
+    """
+    try:
+        session.commit()
+    except exc.IntegrityError as error:
+        _raise_duplicated(session, error, message)
+
+
+def execute_unique(session, statement, message: str):
+    """Execute a statement, raising ValueError if a unique index is violated.
+
+    Same as `commit_unique`, for the UPDATE statements that are executed
+    directly instead of being flushed on commit.
+
+    Args:
+        session: The session to execute the statement.
+        statement: The statement to execute.
+        message (str): Message of the ValueError.
+
+    Returns:
+        The result of the statement.
+    """
+    try:
+        return session.execute(statement)
+    except exc.IntegrityError as error:
+        _raise_duplicated(session, error, message)
+        # Not reached, _raise_duplicated always raises
+        raise
+
+
+engine = create_engine(
+    _get_db_url(), poolclass=MeteredQueuePool, **_get_pool_options())
 Session = scoped_session(sessionmaker(bind=engine))
+
+# Async engine used by handlers that await their queries directly in the
+# event loop instead of sending them to a worker or a thread.
+async_engine = create_async_engine(
+    _get_db_url("aiomysql"),
+    poolclass=MeteredAsyncQueuePool,
+    **_get_pool_options(),
+)
+async_session = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+
+async def get_async_session():
+    """Yield an async session, to be used as a FastAPI dependency."""
+    async with async_session() as session:
+        yield session
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Module to dispatch Celery tasks from the API without blocking.
+
+The routers are ``async def`` endpoints, so calling ``task.get()`` directly
+would block the event loop until the worker answers. The helpers in this
+module send the task and wait for its result in a bounded thread pool, so
+the event loop keeps serving other requests in the meantime.
+"""
+import os
+import asyncio
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from celery.exceptions import TimeoutError as CeleryTimeoutError
+from fastapi import HTTPException
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+# Maximum number of task results the API process waits on at the same time.
+# Requests above this limit are queued until a thread is released.
+MAX_WAITERS = int(os.getenv("DISPATCH_MAX_WAITERS", "64"))
+
+# Timeouts (in seconds) used by the routers while waiting for a task result.
+READ_TIMEOUT = float(os.getenv("TASK_READ_TIMEOUT", "10"))
+WRITE_TIMEOUT = float(os.getenv("TASK_WRITE_TIMEOUT", "30"))
+# For the tasks of the bulk queue, which handle many rows at once.
+BULK_TIMEOUT = float(os.getenv("TASK_BULK_TIMEOUT", "300"))
+
+# Execution mode for simple lookups. With "celery" they are sent to the
+# workers like any other task, with "local" the task body runs directly in
+# the API process, skipping the broker and result backend round trips.
+READ_MODE = os.getenv("TASK_READ_MODE", "celery")
+
+_executor = ThreadPoolExecutor(
+    max_workers=MAX_WAITERS,
+    thread_name_prefix="dispatch",
+)
+
+
+def _get_and_forget(result, timeout: float):
+    """Wait for the result of a task and remove it from the backend."""
+    try:
+        value = result.get(timeout=timeout)
+    except CeleryTimeoutError:
+        # Kept until it expires, since the task can still finish
+        raise
+    except Exception:
+        result.forget()
+        raise
+    result.forget()
+    return value
+
+
+def _send_and_wait(task, args, kwargs, timeout: float):
+    """Send a task and wait for its result in the calling thread.
+
+    The result backend of Celery is not thread-safe, so each thread keeps
+    its own (`app.backend` is thread-local). Sending the task from the same
+    thread that waits for it binds the result to that thread's backend and
+    Redis connection, instead of sharing the one of the event loop thread.
+    """
+    result = task.delay(*args, **kwargs)
+    try:
+        return _get_and_forget(result, timeout)
+    except CeleryTimeoutError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"Task {result.id} did not finish in {timeout} seconds.",
+        ) from exc
+
+
+async def run_task(task, *args, timeout: float = WRITE_TIMEOUT, **kwargs):
+    """Send a task to Celery and wait for its result without blocking.
+
+    The task is sent and waited for in the thread pool, and its result is
+    removed from the backend once it has been read.
+
+    Args:
+        task: The Celery task to be executed.
+        *args: Positional arguments for the task.
+        timeout (float): Seconds to wait for the result before giving up.
+        **kwargs: Keyword arguments for the task.
+
+    Returns:
+        The value returned by the task.
+
+    Raises:
+        HTTPException: If the task does not finish before the timeout.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor,
+        partial(_send_and_wait, task, args, kwargs, timeout),
+    )
+
+
+def send_task(task, *args, **kwargs) -> str:
+    """Send a task to Celery without waiting for it.
+
+    For fire-and-forget tasks, whose result nobody reads: the task is sent
+    with `ignore_result`, so its result is not stored in the backend at
+    all, instead of being stored and then forgotten like in `run_task`.
+
+    Returns:
+        str: The ID of the task.
+    """
+    return task.apply_async(args, kwargs, ignore_result=True).id
+
+
+async def run_read(task, *args, timeout: float = READ_TIMEOUT, **kwargs):
+    """Run a simple lookup task using the configured execution mode.
+
+    In "local" mode the body of the task is executed in the thread pool of
+    the API process, using the thread-local database session. Otherwise the
+    task is sent to Celery like in `run_task`.
+
+    Args:
+        task: The Celery task to be executed.
+        *args: Positional arguments for the task.
+        timeout (float): Seconds to wait for the result before giving up.
+        **kwargs: Keyword arguments for the task.
+
+    Returns:
+        The value returned by the task.
+
+    Raises:
+        HTTPException: If the task does not finish before the timeout.
+    """
+    if READ_MODE != "local":
+        return await run_task(task, *args, timeout=timeout, **kwargs)
+    loop = asyncio.get_running_loop()
+    try:
+        return await asyncio.wait_for(
+            loop.run_in_executor(_executor, partial(task, *args, **kwargs)),
+            timeout=timeout,
+        )
+    except asyncio.TimeoutError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"Task {task.name} did not finish in {timeout} seconds.",
+        ) from exc
+
+
+def trusted_response(content) -> JSONResponse:
+    """Return the output of a task as the response, without validating it.
+
+    FastAPI validates the value returned by an endpoint against its response
+    model before serializing it. The output of the tasks is already built
+    from the same schemas, so for large results the routers can use this to
+    skip the second validation. Only for task output: it must have the
+    shape of the response model, with JSON types only.
+    """
+    return JSONResponse(content)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Conditional GET support for the list endpoints.
+
+The version of a list is taken from the versions of the tags of the tables
+it reads in `response_cache`, which every task that changes a table
+increments after its commit. They are read from Redis with a single MGET,
+so a request whose `If-None-Match` header matches the current version is
+answered with 304 without querying the database or dispatching any task.
+The versions expire after RESPONSE_CACHE_TTL, so a change that was not
+invalidated is noticed at most that many seconds later.
+
+If Redis is not available, the response is sent without ETag.
+"""
+import hashlib
+import logging
+import redis
+from fastapi import Depends
+from fastapi import HTTPException
+from fastapi import Request
+from fastapi import status
+from starlette.datastructures import MutableHeaders
+import response_cache
+
+logger = logging.getLogger(__name__)
+
+
+async def get_version(*models) -> str:
+    """Return a version token of the rows of the given models.
+
+    Args:
+        *models: Model classes, all of them inheriting from `models.Base`.
+
+    Returns:
+        str: The token, which changes when a row is added, removed or
+        updated in any of the tables.
+
+    Raises:
+        redis.RedisError: If Redis is not available.
+    """
+    tables = sorted(model.__tablename__ for model in models)
+    versions = await response_cache.get_versions(*tables)
+    return hashlib.sha1(repr(list(zip(tables, versions))).encode()).hexdigest()
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header with an ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque
+        for tag in if_none_match.split(",")
+    )
+
+
+def conditional(*models):
+    """Dependency that adds an ETag to the response of a list endpoint.
+
+    If the request has an `If-None-Match` header that matches the current
+    version of the tables, the request is answered with 304 Not Modified
+    and the endpoint is not executed. Use it in the route decorator:
+
+        @router.get("/get-x", dependencies=[etag.conditional(models.X)])
+
+    Args:
+        *models: Model classes read by the endpoint.
+    """
+    async def check_etag(request: Request):
+        try:
+            etag = f'W/"{await get_version(*models)}"'
+        except redis.RedisError as exc:
+            logger.warning("ETag not available: %s", exc)
+            return
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag},
+            )
+        # Added to the response by ETagMiddleware
+        request.state.etag = etag
+
+    return Depends(check_etag)
+
+
+class ETagMiddleware:
+    """ASGI middleware that adds the ETag of `conditional` to the response.
+
+    The ETag is passed in the request state instead of the response of the
+    dependency, so it is also added to the responses returned directly by
+    the endpoints, e.g. the cached ones.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start":
+                etag = scope.get("state", {}).get("etag")
+                headers = MutableHeaders(scope=message)
+                if etag and "etag" not in headers:
+                    headers["ETag"] = etag
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
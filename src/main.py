@@ -1,20 +1,27 @@
 #!/usr/bin/env python
 """Main module for the FastAPI application."""
 import asyncio
+import logging
 from typing import Annotated
+import redis
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import WebSocket
 from fastapi import Depends
+from fastapi import status
 from fastapi.responses import JSONResponse
-from celery.result import AsyncResult
-from celery_worker import celery_app
+from starlette.websockets import WebSocketState
+import task_events
+import etag
 from sellers.router import router as sellers_router
 from shippers.router import router as shippers_router
 from shipping.router import router as shipping_router
 from products.router import router as products_router
+from metrics.router import router as metrics_router
+from task_results.router import router as task_results_router
 from auth import get_current_username
 
+logger = logging.getLogger(__name__)
 
 origins = [
     "http://localhost",
@@ -30,13 +37,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # So the frontends can send the ETag back in If-None-Match
+    expose_headers=["ETag"],
 )
 
+# Add the ETag of the list endpoints to their responses
+app.add_middleware(etag.ETagMiddleware)
+
 # Include routers
 app.include_router(sellers_router, prefix="/sellers", tags=["sellers"])
 app.include_router(shippers_router, prefix="/shippers", tags=["shippers"])
 app.include_router(shipping_router, prefix="/shipping", tags=["shipping"])
 app.include_router(products_router, prefix="/products", tags=["products"])
+app.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
+app.include_router(task_results_router, prefix="/tasks", tags=["tasks"])
 
 
 # Include exception handlers
@@ -70,21 +84,43 @@ def read_root():
 
 @app.websocket("/ws/task/{task_id}")
 async def websocket_endpoint(websocket: WebSocket, task_id: str):
-    """Websocket endpoint to get the task result."""
-    await websocket.accept()
-
-    # Get the task result asynchronously
-    result = AsyncResult(task_id, app=celery_app)
+    """Websocket endpoint to follow the state of a task.
 
-    while not result.ready():
-        await websocket.send_text("Processing...")
-        await asyncio.sleep(1)
+    A JSON message with the state of the task is sent when the socket is
+    opened, and then every time the state changes, until the task is ready:
+    `{"task_id": ..., "state": ..., "result": ...}`. The result of the
+    intermediate states is their metadata, e.g. the progress of the task.
+    """
+    await websocket.accept()
 
-    # If result is successful, send the state and result
-    if result.successful():
-        await websocket.send_text(f"Task {task_id} succeeded: {result.result}")
-    else:
-        await websocket.send_text(f"Task {task_id} failed: {result.result}")
+    async def send_states():
+        async for message in task_events.follow_task(task_id):
+            await websocket.send_json(message)
+
+    async def wait_disconnect():
+        # The messages of the client, e.g. pings, are ignored
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    # Stop following the task as soon as the client disconnects
+    sender = asyncio.create_task(send_states())
+    receiver = asyncio.create_task(wait_disconnect())
+    close_code = status.WS_1011_INTERNAL_ERROR
+    try:
+        done, _ = await asyncio.wait(
+            {sender, receiver},
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        if sender in done:
+            sender.result()
+            close_code = status.WS_1000_NORMAL_CLOSURE
+    except redis.RedisError as exc:
+        logger.warning("Could not follow the task %s: %s", task_id, exc)
+    finally:
+        sender.cancel()
+        receiver.cancel()
+        if websocket.client_state == WebSocketState.CONNECTED:
+            await websocket.close(code=close_code)
 
 
 @app.get("/users/me")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""Router for the API metrics"""
+import json
+import redis.asyncio
+from fastapi import APIRouter
+from database import engine
+from database import async_engine
+from database import get_pool_stats
+import response_cache
+from celery_worker import REDIS_URL
+from celery_worker import celery_app
+from celery_worker import POOL_STATS_KEY
+from . import schemas
+
+router = APIRouter()
+
+_redis = redis.asyncio.Redis.from_url(REDIS_URL)
+
+
+@router.get("/db-pool")
+async def get_db_pool_stats() -> schemas.DbPoolStatsResponse:
+    """Get the connection pool statistics of this API process and the workers
+
+    Every worker process pushes the statistics of its pool periodically
+    (see celery_worker.POOL_STATS_INTERVAL), so they can be a few seconds
+    old. The counters of a worker process start at zero when it starts.
+    """
+    keys = [
+        key async for key in
+        _redis.scan_iter(match=f"{POOL_STATS_KEY}:*", count=1000)
+    ]
+    values = await _redis.mget(keys) if keys else []
+    workers = sorted(
+        (json.loads(value) for value in values if value is not None),
+        key=lambda stats: (stats["hostname"], stats["pid"]),
+    )
+    return schemas.DbPoolStatsResponse(
+        engine=get_pool_stats(engine),
+        async_engine=get_pool_stats(async_engine),
+        workers=workers,
+    )
+
+
+@router.get("/response-cache")
+async def get_response_cache_stats() -> schemas.ResponseCacheStatsResponse:
+    """Get the response cache hits and misses of this API process"""
+    return schemas.ResponseCacheStatsResponse(
+        endpoints=response_cache.metrics.as_dict(),
+    )
+
+
+@router.get("/result-backend")
+async def get_result_backend_stats() -> schemas.ResultBackendStatsResponse:
+    """Get the number of task results and the memory of the result backend
+
+    The task results are counted with SCAN, so the count is approximate if
+    results are added or removed meanwhile.
+    """
+    pattern = celery_app.backend.get_key_for_task("*")
+    task_results = 0
+    async for _ in _redis.scan_iter(match=pattern, count=1000):
+        task_results += 1
+    memory = await _redis.info("memory")
+    return schemas.ResultBackendStatsResponse(
+        task_results=task_results,
+        keys=await _redis.dbsize(),
+        used_memory=memory["used_memory"],
+        result_expires=celery_app.conf.result_expires,
+    )
@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""Metrics schemas"""
+from pydantic import BaseModel
+
+
+class PoolStats(BaseModel):
+    """Connection pool statistics schema"""
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    avg_checkout_ms: float
+    max_checkout_ms: float
+    waits: int
+    wait_time_ms: float
+    timeouts: int
+
+
+class WorkerPoolStats(BaseModel):
+    """Connection pool statistics of a worker process schema"""
+    # Name of the worker node, e.g. "reads@host"
+    hostname: str
+    pid: int
+    engine: PoolStats
+
+
+class DbPoolStatsResponse(BaseModel):
+    """Database pools statistics response schema"""
+    engine: PoolStats
+    async_engine: PoolStats
+    workers: list[WorkerPoolStats]
+
+
+class EndpointCacheStats(BaseModel):
+    """Response cache counters of an endpoint schema"""
+    hits: int
+    misses: int
+    errors: int
+
+
+class ResponseCacheStatsResponse(BaseModel):
+    """Response cache statistics response schema"""
+    endpoints: dict[str, EndpointCacheStats]
+
+
+class ResultBackendStatsResponse(BaseModel):
+    """Result backend statistics response schema"""
+    task_results: int
+    keys: int
+    # Bytes used by Redis
+    used_memory: int
+    # Seconds the task results are kept
+    result_expires: int
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Alembic environment of the tienda database.
+
+The target metadata is `models.Base.metadata`, with the tables of every
+app package, so `alembic revision --autogenerate` compares the database
+with the models. The database URL is the same one used by the app.
+
+Usage (from the ``src`` directory):
+    alembic upgrade head
+    alembic revision --autogenerate -m "Describe the change"
+"""
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import create_engine
+from sqlalchemy import pool
+from database import _get_db_url
+from models import Base
+# Import every model so all the tables are registered in the metadata
+from sellers import models as _sellers_models  # noqa: F401 pylint: disable=unused-import
+from shippers import models as _shippers_models  # noqa: F401 pylint: disable=unused-import
+from shipping import models as _shipping_models  # noqa: F401 pylint: disable=unused-import
+from products import models as _products_models  # noqa: F401 pylint: disable=unused-import
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def get_url():
+    """Return the database URL, unless it was given to Alembic."""
+    return config.get_main_option("sqlalchemy.url") or _get_db_url()
+
+
+def run_migrations_offline():
+    """Write the SQL of the migrations instead of running them."""
+    context.configure(
+        url=get_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Run the migrations against the database."""
+    connectable = create_engine(get_url(), poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            compare_type=True,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Helpers to change the indexes of large tables without downtime.
+
+On MySQL (InnoDB) the indexes are built with online DDL, so the table can
+still be read and written while the index is created. With ALGORITHM=INPLACE
+and LOCK=NONE MySQL fails if that is not possible, instead of falling back
+to a copy of the table that blocks the writes. On other databases (e.g. the
+SQLite of the benchmarks) the regular Alembic operations are used, and the
+unique indexes are created as unique constraints, like in the models.
+"""
+from alembic import op
+
+
+def _is_mysql():
+    return op.get_context().dialect.name == "mysql"
+
+
+def create_index(name: str, table: str, columns: list[str], unique: bool = False):
+    """Create an index without blocking the writes to the table"""
+    if not _is_mysql():
+        if unique:
+            with op.batch_alter_table(table) as batch:
+                batch.create_unique_constraint(name, columns)
+        else:
+            op.create_index(name, table, columns)
+        return
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    op.execute(
+        f"ALTER TABLE {table} ADD {kind} {name} ({', '.join(columns)}), "
+        "ALGORITHM=INPLACE, LOCK=NONE"
+    )
+
+
+def drop_index(name: str, table: str, unique: bool = False):
+    """Drop an index without blocking the writes to the table"""
+    if not _is_mysql():
+        if unique:
+            with op.batch_alter_table(table) as batch:
+                batch.drop_constraint(name, type_="unique")
+        else:
+            op.drop_index(name, table_name=table)
+        return
+    op.execute(f"ALTER TABLE {table} DROP INDEX {name}, ALGORITHM=INPLACE, LOCK=NONE")
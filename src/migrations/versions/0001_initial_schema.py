@@ -0,0 +1,126 @@
+# pylint: disable=invalid-name
+"""Initial schema
+
+The tables as they were defined by the models before the migrations were
+added. An existing database with this schema must be stamped with this
+revision (`alembic stamp 0001`) before upgrading it.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 02:46:56.721440
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'locations',
+        sa.Column('id_location', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('location_name', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id_location', name=op.f('pk_locations')),
+    )
+    op.create_table(
+        'product_statuses',
+        sa.Column('id_product_status', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('status_name', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id_product_status', name=op.f('pk_product_statuses')),
+    )
+    op.create_table(
+        'sellers',
+        sa.Column('id_seller', sa.Integer(), nullable=False),
+        sa.Column('seller_name', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id_seller', name=op.f('pk_sellers')),
+    )
+    op.create_table(
+        'shippers',
+        sa.Column('id_shipper', sa.Integer(), nullable=False),
+        sa.Column('shipper_name', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id_shipper', name=op.f('pk_shippers')),
+    )
+    op.create_table(
+        'shipping_statuses',
+        sa.Column('id_status', sa.Integer(), nullable=False),
+        sa.Column('status_name', sa.String(length=50), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id_status', name=op.f('pk_shipping_statuses')),
+    )
+    op.create_table(
+        'shipping_groups',
+        sa.Column('id_shipping_group', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('shipping_group_name', sa.String(length=255), nullable=False),
+        sa.Column('id_shipper', sa.Integer(), nullable=False),
+        sa.Column('id_status', sa.Integer(), nullable=False),
+        sa.Column('shipping_cost', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('dollar_price', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('tax', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['id_shipper'], ['shippers.id_shipper'],
+            name=op.f('fk_shipping_groups_id_shipper_shippers'),
+        ),
+        sa.ForeignKeyConstraint(
+            ['id_status'], ['shipping_statuses.id_status'],
+            name=op.f('fk_shipping_groups_id_status_shipping_statuses'),
+        ),
+        sa.PrimaryKeyConstraint('id_shipping_group', name=op.f('pk_shipping_groups')),
+    )
+    op.create_table(
+        'products',
+        sa.Column('id_product', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('description', sa.String(length=255), nullable=False),
+        sa.Column('shipping_label', sa.String(length=255), nullable=False),
+        sa.Column('purchase_price', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('sale_price', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('id_product_status', sa.Integer(), nullable=False),
+        sa.Column('id_location', sa.Integer(), nullable=False),
+        sa.Column('id_shipping_group', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['id_location'], ['locations.id_location'],
+            name=op.f('fk_products_id_location_locations'),
+        ),
+        sa.ForeignKeyConstraint(
+            ['id_product_status'], ['product_statuses.id_product_status'],
+            name=op.f('fk_products_id_product_status_product_statuses'),
+        ),
+        sa.ForeignKeyConstraint(
+            ['id_shipping_group'], ['shipping_groups.id_shipping_group'],
+            name=op.f('fk_products_id_shipping_group_shipping_groups'),
+        ),
+        sa.PrimaryKeyConstraint('id_product', name=op.f('pk_products')),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('products')
+    op.drop_table('shipping_groups')
+    op.drop_table('shipping_statuses')
+    op.drop_table('shippers')
+    op.drop_table('sellers')
+    op.drop_table('product_statuses')
+    op.drop_table('locations')
@@ -0,0 +1,40 @@
+# pylint: disable=invalid-name
+"""Add the product count of the shipping groups
+
+The number of products of every shipping group is maintained by the product
+tasks, so the purchase price formula doesn't count the products table on
+every query. It is filled in from the current products.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 02:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'shipping_groups',
+        sa.Column('product_count', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.execute(
+        "UPDATE shipping_groups SET product_count = ("
+        "SELECT COUNT(*) FROM products "
+        "WHERE products.id_shipping_group = shipping_groups.id_shipping_group)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('shipping_groups', 'product_count')
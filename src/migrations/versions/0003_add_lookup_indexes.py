@@ -0,0 +1,60 @@
+# pylint: disable=invalid-name
+"""Add unique indexes for the lookups by name
+
+Unique indexes of the names used to look up the reference tables, and of
+the shipping label of a product within its shipping group. The indexes are
+built online (see migrations/online.py).
+
+Duplicated values must be removed before upgrading, e.g.:
+    SELECT id_shipping_group, shipping_label, COUNT(*) FROM products
+    GROUP BY id_shipping_group, shipping_label HAVING COUNT(*) > 1;
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 02:51:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from migrations import online
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Index name, table and columns
+INDEXES = (
+    ('uq_sellers_seller_name', 'sellers', ['seller_name']),
+    ('uq_shippers_shipper_name', 'shippers', ['shipper_name']),
+    ('uq_shipping_statuses_status_name', 'shipping_statuses', ['status_name']),
+    ('uq_shipping_groups_shipping_group_name', 'shipping_groups', ['shipping_group_name']),
+    ('uq_product_statuses_status_name', 'product_statuses', ['status_name']),
+    ('uq_locations_location_name', 'locations', ['location_name']),
+    ('uq_products_id_shipping_group_shipping_label', 'products',
+     ['id_shipping_group', 'shipping_label']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The names could have been created without a length, which can't be
+    # indexed. These are small tables.
+    with op.batch_alter_table('sellers') as batch:
+        batch.alter_column('seller_name', type_=sa.String(length=255), existing_nullable=False)
+    with op.batch_alter_table('shippers') as batch:
+        batch.alter_column('shipper_name', type_=sa.String(length=255), existing_nullable=False)
+    with op.batch_alter_table('shipping_statuses') as batch:
+        batch.alter_column('status_name', type_=sa.String(length=50), existing_nullable=False)
+
+    for name, table, columns in INDEXES:
+        online.create_index(name, table, columns, unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        online.drop_index(name, table, unique=True)
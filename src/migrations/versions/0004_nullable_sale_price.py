@@ -0,0 +1,41 @@
+# pylint: disable=invalid-name
+"""Allow products without a sale price
+
+Products are added without a sale price, which is set later with the
+add-sale-price endpoints, but the column was declared NOT NULL.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 02:52:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('products') as batch:
+        batch.alter_column(
+            'sale_price',
+            existing_type=sa.Numeric(precision=10, scale=2),
+            nullable=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('products') as batch:
+        batch.alter_column(
+            'sale_price',
+            existing_type=sa.Numeric(precision=10, scale=2),
+            nullable=False,
+        )
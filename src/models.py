@@ -10,11 +10,22 @@ from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy import DateTime
 from sqlalchemy import Column
 from sqlalchemy import func
+from sqlalchemy import MetaData
 
 
 class Base(DeclarativeBase):
     """Base class for all models"""
 
+    # Names of the indexes and constraints, so they are the same in every
+    # database and can be referenced by the migrations
+    metadata = MetaData(naming_convention={
+        "ix": "ix_%(column_0_label)s",
+        "uq": "uq_%(table_name)s_%(column_0_N_name)s",
+        "ck": "ck_%(table_name)s_%(constraint_name)s",
+        "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
+        "pk": "pk_%(table_name)s",
+    })
+
     created_at = Column(
         "created_at",
         DateTime,
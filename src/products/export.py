@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""Streaming export of the product catalog.
+
+The products are read with a server-side cursor of the async engine and
+written in batches, so the memory used by an export doesn't depend on the
+size of the catalog. The export runs in the API process, since a Celery
+result would need to hold the whole catalog at once.
+"""
+import io
+import csv
+import json
+from database import async_session
+from . import queries
+
+# Number of rows fetched from the server-side cursor at a time
+BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = (
+    "id_product",
+    "description",
+    "shipping_label",
+    "purchase_price",
+    "shipping_group_name",
+    "status_name",
+    "location_name",
+    "purchase_price_mxn",
+    "sale_price",
+    "profit",
+)
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _format_ndjson(rows):
+    """Format rows as newline-delimited JSON"""
+    return "".join(
+        json.dumps(
+            {column: getattr(row, column) for column in EXPORT_COLUMNS},
+            default=float,  # Numeric columns are read as Decimal
+        ) + "\n"
+        for row in rows
+    )
+
+
+def _format_csv(rows):
+    """Format rows as CSV lines"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        [getattr(row, column) for column in EXPORT_COLUMNS] for row in rows
+    )
+    return buffer.getvalue()
+
+
+async def export_products(export_format: str):
+    """Yield the products, in batches, formatted as NDJSON or CSV"""
+    if export_format not in MEDIA_TYPES:
+        raise ValueError(f"Export format '{export_format}' not supported.")
+    if export_format == "csv":
+        yield ",".join(EXPORT_COLUMNS) + "\r\n"
+    format_rows = _format_csv if export_format == "csv" else _format_ndjson
+
+    query = queries.get_product_query()
+    async with async_session() as session:
+        result = await session.stream(
+            query.execution_options(yield_per=BATCH_SIZE))
+        async for rows in result.partitions():
+            yield format_rows(rows)
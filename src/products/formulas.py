@@ -1,27 +1,49 @@
 #!/usr/bin/python3
-"""This module defines formulas needed to product management."""
+"""This module defines formulas needed to product management.
+
+Formulas that depend on other computed columns (e.g. profit depends on
+purchase_price_mxn) should not repeat the expression of the column they use.
+Instead, the base columns are computed once in a CTE with
+`add_derived_columns`, and the dependent formulas reference the CTE columns.
+"""
+from sqlalchemy import select
 from sqlalchemy.sql.expression import case
 from sqlalchemy.sql import func
 
 
-def calculate_purchase_price_mxn(product, shipping_group, product_count_subquery):
+def calculate_purchase_price_mxn(product, shipping_group):
     """
     Calculate the purchase price in MXN (purchase_price_mxn).
     """
     return (
         func.round(
             product.purchase_price * shipping_group.dollar_price * (1 + (shipping_group.tax * 0.01)) +
-            (shipping_group.shipping_cost / product_count_subquery.c.product_count) * shipping_group.dollar_price,
+            (shipping_group.shipping_cost / shipping_group.product_count) * shipping_group.dollar_price,
             2  # Round to 2 decimal places
         )
     ).label('purchase_price_mxn')
 
 
-def calculate_profit(product, purchase_price_mxn):
+def calculate_profit(columns):
     """
     Calculate profit if sale_price is not None, otherwise return None.
+
+    `columns` must provide the sale_price and purchase_price_mxn columns,
+    e.g. the columns of the CTE built by `add_derived_columns`.
     """
     return case(
-        (product.sale_price.is_(None), None),  # If sale_price is NULL, profit is NULL
-        else_=product.sale_price - purchase_price_mxn
+        (columns.sale_price.is_(None), None),  # If sale_price is NULL, profit is NULL
+        else_=columns.sale_price - columns.purchase_price_mxn
     ).label('profit')
+
+
+def add_derived_columns(query, *formulas, name="base"):
+    """
+    Wrap the query in a CTE and add the columns computed by the formulas.
+
+    Each formula is called with the columns of the CTE and must return a
+    labeled expression. This way the columns of the query are computed only
+    once, and the derived columns just reference them.
+    """
+    base = query.cte(name)
+    return select(*base.c, *(formula(base.c) for formula in formulas))
@@ -5,6 +5,7 @@ from sqlalchemy import Integer
 from sqlalchemy import String
 from sqlalchemy import Numeric
 from sqlalchemy import ForeignKey
+from sqlalchemy import UniqueConstraint
 from sqlalchemy.orm import relationship
 from models import Base
 
@@ -14,7 +15,7 @@ class ProductStatus(Base):
     __tablename__ = 'product_statuses'
 
     id_product_status = Column(Integer, primary_key=True, autoincrement=True)
-    status_name = Column(String(255), nullable=False)
+    status_name = Column(String(255), nullable=False, unique=True)
 
     # Relationships
     products = relationship("Product", back_populates="product_status")
@@ -25,7 +26,7 @@ class Location(Base):
     __tablename__ = 'locations'
 
     id_location = Column(Integer, primary_key=True, autoincrement=True)
-    location_name = Column(String(255), nullable=False)
+    location_name = Column(String(255), nullable=False, unique=True)
 
     # Relationships
     products = relationship("Product", back_populates="location")
@@ -34,12 +35,17 @@ class Location(Base):
 class Product(Base):
     """product model"""
     __tablename__ = 'products'
+    __table_args__ = (
+        # The shipping label identifies a product within its shipping group
+        UniqueConstraint('id_shipping_group', 'shipping_label'),
+    )
 
     id_product = Column(Integer, primary_key=True, autoincrement=True)
     description = Column(String(255), nullable=False)
     shipping_label = Column(String(255), nullable=False)
     purchase_price = Column(Numeric(10, 2), nullable=False)
-    sale_price = Column(Numeric(10, 2), nullable=False)
+    # Set after the product is added, with the add-sale-price endpoints
+    sale_price = Column(Numeric(10, 2), nullable=True)
     id_product_status = Column(
         Integer,
         ForeignKey('product_statuses.id_product_status'),
@@ -1,32 +1,45 @@
 #!/usr/bin/env python
 """This module defines common queries for product management."""
-from sqlalchemy import select
+from sqlalchemy import case
 from sqlalchemy import func
-from sqlalchemy.orm import aliased
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.dialects import mysql
+import reference_cache
 from shipping.models import ShippingGroup
 from . import models
 from . import formulas
 
+# Page size of the product listings
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
 
 def get_product_query(
-        session,
         product_id=None,
         id_shipping_group=None,
         shipping_label=None,
+        status=None,
+        location=None,
+        min_price=None,
+        max_price=None,
+        after_id=None,
+        limit=None,
         ):
-    """Get product query"""
-    # Create an alias for the subquery counting products per shipping group
-    subquery = select(
-        models.Product.id_shipping_group,
-        func.count(models.Product.id_product).label('product_count')  # pylint: disable=not-callable
-    ).group_by(models.Product.id_shipping_group).alias()
-
-    # Create an alias to work with the subquery
-    ProductCount = aliased(subquery)  # pylint: disable=invalid-name
-    # Main query to fetch the required fields, including the "profit"
-    # Main query using ORM models
+    """Get product query
+
+    The query is returned as a select statement that is not bound to any
+    session, so it can be executed with both the sync and the async engines,
+    e.g. `session.execute(query)` or `await async_session.execute(query)`.
+
+    Products are sorted by id_product. To paginate, pass the id_product of
+    the last product of the previous page as after_id, so only the rows of
+    the requested page are read and computed.
+    """
+    # Main query to fetch the required fields. The purchase price is computed
+    # once here, and the profit is derived from it in the outer query.
     query = (
-        session.query(
+        select(
             models.Product.id_product,
             models.Product.description,
             models.Product.shipping_label,
@@ -41,59 +54,218 @@ def get_product_query(
             formulas.calculate_purchase_price_mxn(
                 models.Product,
                 ShippingGroup,
-                ProductCount,
-            ),
-            # Calculate profit using the helper function
-            formulas.calculate_profit(
-                models.Product,
-                formulas.calculate_purchase_price_mxn(
-                    models.Product,
-                    ShippingGroup,
-                    ProductCount,
-                ),
             ),
             models.Product.sale_price,
         )
         .join(ShippingGroup, models.Product.id_shipping_group == ShippingGroup.id_shipping_group)
         .join(models.Location, models.Product.id_location == models.Location.id_location)
-        .join(ProductCount, models.Product.id_shipping_group == ProductCount.c.id_shipping_group)
         .join(models.ProductStatus, models.Product.id_product_status == models.ProductStatus.id_product_status)
     )
 
     # If product_id is provided, apply the filter
     if product_id:
-        query = query.filter(models.Product.id_product == product_id)
+        query = query.where(models.Product.id_product == product_id)
 
     # If shipping_group_name is provided, apply the filter
     if id_shipping_group:
-        query = query.filter(models.Product.id_shipping_group == id_shipping_group)
+        query = query.where(models.Product.id_shipping_group == id_shipping_group)
 
     # If shipping_label is provided, apply the filter
     if shipping_label:
-        query = query.filter(models.Product.shipping_label == shipping_label)
+        query = query.where(models.Product.shipping_label == shipping_label)
+
+    # Filters of the product listings
+    if status is not None:
+        query = query.where(models.ProductStatus.status_name == status)
+    if location is not None:
+        query = query.where(models.Location.location_name == location)
+    if min_price is not None:
+        query = query.where(models.Product.sale_price >= min_price)
+    if max_price is not None:
+        query = query.where(models.Product.sale_price <= max_price)
+
+    # Keyset pagination, the page is limited before computing the formulas
+    if after_id is not None:
+        query = query.where(models.Product.id_product > after_id)
+    query = query.order_by(models.Product.id_product)
+    if limit is not None:
+        query = query.limit(limit)
+
+    # Calculate profit from the purchase_price_mxn column of the base query
+    derived = formulas.add_derived_columns(
+        query,
+        formulas.calculate_profit,
+        name="product_costs",
+    )
+    return derived.order_by(derived.selected_columns.id_product)
+
 
-    return query
+def dump_sql(query):
+    """Return the SQL of a query as it is sent to MySQL
 
+    Useful to review the generated SQL, e.g. to check that the formulas
+    are not computed more than once (see benchmarks/product_sql.py).
+    """
+    return str(query.compile(
+        dialect=mysql.dialect(),
+        compile_kwargs={"literal_binds": True},
+    ))
 
-def get_product_status_by_name(session, status_name):
-    """Get product status by name"""
-    db_status = session.scalar(
+
+def select_product_status_by_name(status_name):
+    """Select statement of a product status by name"""
+    return (
         select(models.ProductStatus)
         .where(models.ProductStatus.status_name == status_name)
     )
-    if not db_status:
+
+
+def get_product_status_id_by_name(session, status_name):
+    """Get product status ID by name, using the reference cache"""
+    id_product_status = reference_cache.get_or_load(
+        models.ProductStatus.__tablename__,
+        ("name", status_name),
+        lambda: session.scalar(
+            select_product_status_by_name(status_name)
+            .with_only_columns(models.ProductStatus.id_product_status)),
+    )
+    if id_product_status is None:
         raise ValueError(
             f"Status '{status_name}' not found.")
-    return db_status
+    return id_product_status
 
 
-def get_product_location_by_name(session, location_name):
-    """Get product location by name"""
-    db_location = session.scalar(
+def select_product_location_by_name(location_name):
+    """Select statement of a product location by name"""
+    return (
         select(models.Location)
         .where(models.Location.location_name == location_name)
     )
-    if not db_location:
+
+
+def get_product_location_id_by_name(session, location_name):
+    """Get product location ID by name, using the reference cache"""
+    id_location = reference_cache.get_or_load(
+        models.Location.__tablename__,
+        ("name", location_name),
+        lambda: session.scalar(
+            select_product_location_by_name(location_name)
+            .with_only_columns(models.Location.id_location)),
+    )
+    if id_location is None:
         raise ValueError(
             f"Location '{location_name}' not found.")
-    return db_location
+    return id_location
+
+
+def get_ids_by_name(session, name_column, id_column, names):
+    """Get a mapping of name to ID for all the given names in one query
+
+    Names that are not found in the database are not included.
+    """
+    if not names:
+        return {}
+    return dict(session.execute(
+        select(name_column, id_column).where(name_column.in_(set(names)))
+    ).all())
+
+
+def get_existing_shipping_labels(session, keys):
+    """Get the (id_shipping_group, shipping_label) pairs that already exist
+
+    All the given pairs are looked up in one query. It can read a few more
+    pairs than the given ones, which are not included in the result.
+    """
+    keys = set(keys)
+    if not keys:
+        return set()
+    rows = session.execute(
+        select(models.Product.id_shipping_group, models.Product.shipping_label)
+        .where(
+            models.Product.id_shipping_group.in_(
+                {id_shipping_group for id_shipping_group, _ in keys}),
+            models.Product.shipping_label.in_(
+                {shipping_label for _, shipping_label in keys}),
+        )
+    ).all()
+    return {tuple(row) for row in rows} & keys
+
+
+def update_product_count(session, id_shipping_group, delta):
+    """Add delta to the number of products of a shipping group
+
+    This must be called in the same transaction that adds, moves or deletes
+    the products, so the count is always in sync with the products table.
+    """
+    session.execute(
+        update(ShippingGroup)
+        .where(ShippingGroup.id_shipping_group == id_shipping_group)
+        .values(
+            product_count=ShippingGroup.product_count + delta,
+            # The count is derived data, it is not a change of the group
+            updated_at=ShippingGroup.updated_at,
+        )
+    )
+
+
+def move_product_count(session, product_id, id_shipping_group):
+    """Move a product to another shipping group in the product counts
+
+    The current group of the product is read in a subquery, so both counts
+    are updated in a single statement without loading the product. Nothing
+    changes if the product is already in the group. This must be called in
+    the same transaction that updates the id_shipping_group of the product,
+    and before it.
+    """
+    current_group = (
+        select(models.Product.id_shipping_group)
+        .where(models.Product.id_product == product_id)
+        .scalar_subquery()
+    )
+    session.execute(
+        update(ShippingGroup)
+        .where(
+            ShippingGroup.id_shipping_group.in_(
+                [id_shipping_group, current_group]),
+            func.coalesce(current_group, 0) != id_shipping_group,
+        )
+        .values(
+            product_count=ShippingGroup.product_count + case(
+                (ShippingGroup.id_shipping_group == id_shipping_group, 1),
+                else_=-1,
+            ),
+            updated_at=ShippingGroup.updated_at,
+        )
+        # No groups are loaded in the session, so don't SELECT them to
+        # synchronize it, which MySQL would do without RETURNING
+        .execution_options(synchronize_session=False)
+    )
+
+
+def remove_product_counts(session, product_ids):
+    """Subtract the given products from the counts of their shipping groups
+
+    The number of products of each group is counted in a subquery, so the
+    products are not loaded before deleting them. This must be called in
+    the same transaction that deletes the products, and before it.
+    """
+    products_in_group = (
+        select(func.count())  # pylint: disable=not-callable
+        .where(
+            models.Product.id_shipping_group == ShippingGroup.id_shipping_group,
+            models.Product.id_product.in_(product_ids),
+        )
+        .scalar_subquery()
+    )
+    session.execute(
+        update(ShippingGroup)
+        .where(ShippingGroup.id_shipping_group.in_(
+            select(models.Product.id_shipping_group)
+            .where(models.Product.id_product.in_(product_ids))
+        ))
+        .values(
+            product_count=ShippingGroup.product_count - products_in_group,
+            updated_at=ShippingGroup.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
@@ -1,113 +1,167 @@
 #!/usr/bin/env python
 """Router for the API for product management."""
+import io
+import csv
+from typing import Any
+from typing import Annotated
+from typing import Literal
 from fastapi import APIRouter
+from fastapi import Query
+from fastapi import UploadFile
+from fastapi.responses import StreamingResponse
+from dispatch import run_task
+from dispatch import run_read
+from dispatch import READ_TIMEOUT
+from dispatch import BULK_TIMEOUT
+from dispatch import trusted_response
+import response_cache
+import crud_router
+import etag
+from schemas import BulkDeleteResponse
+from shipping.models import ShippingGroup
+from . import models
 from . import schemas
 from . import tasks
+from . import export
+from .queries import DEFAULT_PAGE_SIZE
+from .queries import MAX_PAGE_SIZE
 
 router = APIRouter()
 
-
-@router.get("/get-products-statuses")
-async def get_products_statuses() -> schemas.GetproductsStatusesResponse:
-    """Get all products statuses"""
-    task = tasks.get_product_statuses.delay()
-    return task.get()
-
-
-@router.get("/get-product-status/{id_product_status}")
-async def get_product_status(id_product_status: int) -> schemas.ProductStatusBase:
-    """Get an product status"""
-    task = tasks.get_product_status.delay(id_product_status)
-    return task.get()
-
-
-@router.get("/add-product-status")
-async def add_product_status(name: str) -> int:
-    """Add an product status"""
-    task = tasks.add_product_status.delay(name)
-    return task.get()
-
-
-@router.put("/update-product-status/{id_product_status}")
-async def update_product_status(id_product_status: int, name: str) -> int:
-    """Update an product status"""
-    task = tasks.update_product_status.delay(id_product_status, name)
-    return task.get()
-
-
-@router.delete("/delete-product-status/{id_product_status}")
-async def delete_product_status(id_product_status: int) -> int:
-    """Delete an product status"""
-    task = tasks.delete_product_status.delay(id_product_status)
-    return task.get()
-
+# Models read by the product endpoints, used to tag their cached responses
+# and to compute the ETag of the listings
+PRODUCT_MODELS = (
+    models.Product,
+    models.ProductStatus,
+    models.Location,
+    ShippingGroup,
+)
+PRODUCT_TABLES = tuple(model.__tablename__ for model in PRODUCT_MODELS)
+
+routes = crud_router.Routes(router, __name__)
+routes.get_all(
+    tasks.product_statuses, "/get-products-statuses",
+    schemas.GetproductsStatusesResponse, "Get all products statuses",
+    name="get_products_statuses",
+    cache=True,
+    dependencies=[etag.conditional(models.ProductStatus)],
+)
+routes.get_one(
+    tasks.product_statuses, "/get-product-status/{id_product_status}",
+    schemas.ProductStatusBase, "Get an product status",
+)
+routes.add(
+    tasks.product_statuses, "/add-product-status", int,
+    "Add an product status", method="GET",
+)
+routes.update(
+    tasks.product_statuses, "/update-product-status/{id_product_status}",
+    int, "Update an product status",
+)
+routes.delete(
+    tasks.product_statuses, "/delete-product-status/{id_product_status}",
+    int, "Delete an product status",
+)
+routes.delete_many(
+    tasks.product_statuses, "/delete-product-statuses",
+    "Delete many product statuses at once\n\n"
+    "The body is the list of product status IDs.",
+)
 
 # Location routes
-@router.get("/get-locations")
-async def get_locations() -> schemas.GetLocationsResponse:
-    """Get all locations"""
-    task = tasks.get_locations.delay()
-    return task.get()
-
-
-@router.get("/get-location/{location_id}")
-async def get_location(location_id: int) -> schemas.LocationBase:
-    """Get a location"""
-    task = tasks.get_location.delay(location_id)
-    return task.get()
-
-
-@router.get("/add-location")
-async def add_location(name: str) -> int:
-    """Add a location"""
-    task = tasks.add_location.delay(name)
-    return task.get()
-
-
-@router.put("/update-location/{location_id}")
-async def update_location(location_id: int, name: str) -> int:
-    """Update a location"""
-    task = tasks.update_location.delay(location_id, name)
-    return task.get()
-
-
-@router.delete("/delete-location/{location_id}")
-async def delete_location(location_id: int) -> int:
-    """Delete a location"""
-    task = tasks.delete_location.delay(location_id)
-    return task.get()
+routes.get_all(
+    tasks.locations, "/get-locations", schemas.GetLocationsResponse,
+    "Get all locations",
+    cache=True,
+    dependencies=[etag.conditional(models.Location)],
+)
+routes.get_one(
+    tasks.locations, "/get-location/{location_id}", schemas.LocationBase,
+    "Get a location",
+)
+routes.add(
+    tasks.locations, "/add-location", int, "Add a location", method="GET")
+routes.update(
+    tasks.locations, "/update-location/{location_id}", int,
+    "Update a location",
+)
+routes.delete(
+    tasks.locations, "/delete-location/{location_id}", int,
+    "Delete a location",
+)
+routes.delete_many(
+    tasks.locations, "/delete-locations",
+    "Delete many locations at once\n\nThe body is the list of location IDs.",
+)
 
 
 # product routes
-@router.get("/get-products")
+@router.get(
+    "/get-products",
+    dependencies=[etag.conditional(*PRODUCT_MODELS)],
+)
+@response_cache.cached(*PRODUCT_TABLES)
 async def get_products(
         shipping_group_name: str | None = None,
+        status: str | None = None,
+        location: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        after_id: int | None = None,
+        limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
         ) -> schemas.GetProductsDetailResponse:
-    """Get all products"""
-    task = tasks.get_products.delay(
+    """Get a page of products
+
+    Products are sorted by ID. Use the `next_cursor` of the response as the
+    `after_id` of the next request to get the following page.
+    """
+    return trusted_response(await run_task(
+        tasks.get_products,
         shipping_group_name=shipping_group_name,
+        status=status,
+        location=location,
+        min_price=min_price,
+        max_price=max_price,
+        after_id=after_id,
+        limit=limit,
+        timeout=READ_TIMEOUT,
+    ))
+
+
+@router.get("/export-products")
+async def export_products(
+        export_format: Literal["ndjson", "csv"] = "ndjson",
+        ) -> StreamingResponse:
+    """Export all products, including the computed prices, as a stream"""
+    return StreamingResponse(
+        export.export_products(export_format),
+        media_type=export.MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition":
+                f"attachment; filename=products.{export_format}",
+        },
     )
-    return task.get()
 
 
 @router.get("/get-product/{product_id}")
+@response_cache.cached(*PRODUCT_TABLES)
 async def get_product(product_id: int) -> schemas.ProductDetailResponse:
     """Get an product"""
-    task = tasks.get_product.delay(product_id)
-    return task.get()
+    return await run_read(tasks.get_product, product_id)
 
 
 @router.get("/get-product-by-shipping-group-and-label")
+@response_cache.cached(*PRODUCT_TABLES)
 async def get_product_by_shipping_group_and_label(
     shipping_group_name: str,
     shipping_label: str,
 ) -> schemas.ProductDetailResponse:
     """Get an product by shipping group and label"""
-    task = tasks.get_product_by_shipping_group_and_label.delay(
+    return await run_read(
+        tasks.get_product_by_shipping_group_and_label,
         shipping_group_name=shipping_group_name,
         shipping_label=shipping_label,
     )
-    return task.get()
 
 
 @router.get("/add-product")
@@ -120,7 +174,8 @@ async def add_product(
     shipping_group_name: str | None = None,
 ) -> int:
     """Add an product"""
-    task = tasks.add_product.delay(
+    return await run_task(
+        tasks.add_product,
         description,
         shipping_label,
         purchase_price,
@@ -128,7 +183,37 @@ async def add_product(
         product_status=product_status,
         shipping_group_name=shipping_group_name,
     )
-    return task.get()
+
+
+@router.post("/import-products")
+async def import_products(
+    products: list[dict[str, Any]],
+) -> schemas.ImportProductsResponse:
+    """Add many products at once
+
+    Each product has the fields of `ProductImportItem`. The products are
+    validated one by one by the task, so the invalid ones are reported in
+    the errors of the response with their position in the list, and the
+    rest are added.
+    """
+    return await run_task(
+        tasks.import_products, products, timeout=BULK_TIMEOUT)
+
+
+@router.post("/import-products-csv")
+async def import_products_csv(file: UploadFile) -> schemas.ImportProductsResponse:
+    """Add many products at once from a CSV file
+
+    The first line of the file must have the column names, which are the
+    same as the fields of the JSON import. Empty values are taken as null.
+    """
+    content = (await file.read()).decode("utf-8-sig")
+    products = [
+        {column: value or None for column, value in row.items()}
+        for row in csv.DictReader(io.StringIO(content))
+    ]
+    return await run_task(
+        tasks.import_products, products, timeout=BULK_TIMEOUT)
 
 
 @router.put("/update-product/{product_id}")
@@ -143,7 +228,8 @@ async def update_product(
     sale_price: float | None = None,
 ) -> schemas.UpdateproductResponse:
     """Update an product"""
-    task = tasks.update_product.delay(
+    return await run_task(
+        tasks.update_product,
         product_id=product_id,
         description=description,
         shipping_label=shipping_label,
@@ -153,7 +239,6 @@ async def update_product(
         id_location=id_location,
         id_shipping_group=id_shipping_group,
     )
-    return task.get()
 
 
 @router.put("/update-product-by-shipping-group-and-label")
@@ -167,7 +252,8 @@ async def update_product_by_shipping_group_and_label(
     status: str | None = None,
 ) -> schemas.UpdateproductResponse:
     """Update an product by shipping group and label"""
-    task = tasks.update_product_by_shipping_group_and_label.delay(
+    return await run_task(
+        tasks.update_product_by_shipping_group_and_label,
         shipping_group_name=shipping_group_name,
         shipping_label=shipping_label,
         description=description,
@@ -176,14 +262,23 @@ async def update_product_by_shipping_group_and_label(
         location=location,
         status=status,
     )
-    return task.get()
 
 
 @router.delete("/delete-product/{product_id}")
 async def delete_product(product_id: int) -> int:
     """Delete an product"""
-    task = tasks.delete_product.delay(product_id)
-    return task.get()
+    return await run_task(tasks.delete_product, product_id)
+
+
+@router.post("/delete-products")
+async def delete_products(product_ids: list[int]) -> BulkDeleteResponse:
+    """Delete many products at once
+
+    The body is the list of product IDs. The IDs that are not found are
+    returned in `not_found`.
+    """
+    return await run_task(
+        tasks.delete_products, product_ids, timeout=BULK_TIMEOUT)
 
 
 @router.post("/add-sale-price")
@@ -193,9 +288,26 @@ async def add_sale_price(
         sale_price: float,
 ) -> int:
     """Add a sale price"""
-    task = tasks.add_sale_price.delay(
+    return await run_task(
+        tasks.add_sale_price,
         shipping_group_name=shipping_group_name,
         shipping_label=shipping_label,
         sale_price=sale_price,
     )
-    return task.get()
+
+
+@router.post("/add-sale-prices")
+async def add_sale_prices(
+        shipping_group_name: str,
+        sale_prices: dict[str, float],
+) -> schemas.AddSalePricesResponse:
+    """Add the sale prices of many products of a shipping group
+
+    The body maps the shipping label of each product to its sale price.
+    """
+    return await run_task(
+        tasks.add_sale_prices,
+        shipping_group_name=shipping_group_name,
+        sale_prices=sale_prices,
+        timeout=BULK_TIMEOUT,
+    )
@@ -2,10 +2,15 @@
 """Seller schemas"""
 from datetime import datetime
 from pydantic import BaseModel
+from pydantic import AliasChoices
+from pydantic import ConfigDict
+from pydantic import Field
 
 
 class ProductStatusBase(BaseModel):
     """product availability base schema"""
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     created_at: datetime
@@ -19,6 +24,8 @@ class GetproductsStatusesResponse(BaseModel):
 
 class LocationBase(BaseModel):
     """Location base schema"""
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     created_at: datetime
@@ -32,6 +39,8 @@ class GetLocationsResponse(BaseModel):
 
 class ProductBase(BaseModel):
     """product base schema"""
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     description: str
     shipping_label: str
@@ -46,12 +55,17 @@ class ProductBase(BaseModel):
 
 class ProductDetailResponse(BaseModel):
     """product detail response schema"""
+    model_config = ConfigDict(from_attributes=True)
+
     id_product: int
     description: str
     shipping_label: str
     purchase_price: float | None
-    shipping_group: str | None
-    status: str
+    # Also read from the columns of the product query
+    shipping_group: str | None = Field(
+        validation_alias=AliasChoices("shipping_group", "shipping_group_name"))
+    status: str = Field(
+        validation_alias=AliasChoices("status", "status_name"))
     location_name: str
     purchase_price_mxn: float | None
     sale_price: float | None
@@ -64,12 +78,45 @@ class GetProductsResponse(BaseModel):
 
 
 class GetProductsDetailResponse(BaseModel):
-    """Get products detail response schema"""
+    """Get products detail response schema
+
+    `next_cursor` is the value to send as `after_id` to get the next page, it
+    is None on the last page.
+    """
     products: list[ProductDetailResponse]
     num_products: int
+    next_cursor: int | None = None
 
 
 class UpdateproductResponse(BaseModel):
     """Update product response schema"""
     id: int
     updated_items: int
+
+
+class ProductImportItem(BaseModel):
+    """Product import item schema"""
+    description: str
+    shipping_label: str
+    purchase_price: float
+    product_location: str
+    product_status: str
+    shipping_group_name: str | None = None
+
+
+class ProductImportError(BaseModel):
+    """Product import error schema"""
+    row: int
+    message: str
+
+
+class ImportProductsResponse(BaseModel):
+    """Import products response schema"""
+    num_products: int
+    errors: list[ProductImportError]
+
+
+class AddSalePricesResponse(BaseModel):
+    """Add sale prices response schema"""
+    num_products: int
+    not_found: list[str]
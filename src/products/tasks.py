@@ -1,229 +1,129 @@
 #!/usr/bin/env python
 """Celery tasks related to products."""
+from collections import Counter
 from celery import shared_task
+from pydantic import TypeAdapter
+from pydantic import ValidationError
 from sqlalchemy import select
+from sqlalchemy import insert
+from sqlalchemy import update
+from sqlalchemy import case
+from sqlalchemy import func
 from database import Session
-from shipping.queries import get_shipping_group_by_name
+from database import commit_unique
+from database import execute_unique
+import crud
+import response_cache
+from shipping.queries import get_shipping_group_id_by_name
+from shipping.models import ShippingGroup
 from . import models
 from . import schemas
 from . import queries
 
 
-@shared_task
-def get_product_statuses():
-    """Get product statuses from database"""
-    with Session() as session:
-        db_statuses = session.scalars(select(models.ProductStatus)).all()
-        statuses = [
-            schemas.ProductStatusBase(
-                id=db_status.id_product_status,
-                name=db_status.status_name,
-                created_at=db_status.created_at,
-                updated_at=db_status.updated_at,
-            ).dict()
-            for db_status in db_statuses
-        ]
-        return schemas.GetproductsStatusesResponse(statuses=statuses).dict()
+# The rows of the product statuses and the locations are read and changed
+# by the generated tasks
+product_statuses = crud.Resource(
+    models.ProductStatus,
+    schemas.ProductStatusBase,
+    "product status",
+    __name__,
+    columns={
+        "id": models.ProductStatus.id_product_status,
+        "name": models.ProductStatus.status_name,
+    },
+    trusted=True,
+)
+get_product_statuses = product_statuses.get_all_task(
+    "get_product_statuses", "statuses")
+get_product_status = product_statuses.get_one_task("get_product_status")
+add_product_status = product_statuses.add_task("add_product_status")
+update_product_status = product_statuses.update_task("update_product_status")
+delete_product_status = product_statuses.delete_task("delete_product_status")
+delete_product_statuses = product_statuses.delete_many_task(
+    "delete_product_statuses")
+
+locations = crud.Resource(
+    models.Location,
+    schemas.LocationBase,
+    "Location",
+    __name__,
+    columns={
+        "id": models.Location.id_location,
+        "name": models.Location.location_name,
+    },
+    trusted=True,
+)
+get_locations = locations.get_all_task("get_locations", "locations")
+get_location = locations.get_one_task("get_location")
+add_location = locations.add_task("add_location")
+update_location = locations.update_task("update_location")
+delete_location = locations.delete_task("delete_location")
+delete_locations = locations.delete_many_task("delete_locations")
+
+
+# Validates a page of products in a single pass
+PRODUCTS_ADAPTER = TypeAdapter(list[schemas.ProductDetailResponse])
+
+
+def build_products_response(products: list[dict], next_cursor=None) -> dict:
+    """Build the response of a page of products
+
+    The products are validated once, all together, and the response is
+    built with `model_construct`, so they are not validated again as the
+    items of the response.
+    """
+    return schemas.GetProductsDetailResponse.model_construct(
+        products=PRODUCTS_ADAPTER.validate_python(products),
+        num_products=len(products),
+        next_cursor=next_cursor,
+    ).model_dump()
 
 
 @shared_task
-def get_product_status(id_product_status: int):
-    """Get product status from database"""
-    with Session() as session:
-        db_status = session.scalar(
-            select(models.ProductStatus)
-            .where(
-                models.ProductStatus.id_product_status == id_product_status
-            )
-        )
-        if not db_status:
-            raise ValueError(
-                f"product status with ID {id_product_status} not found.")
-        return schemas.ProductStatusBase(
-            id=db_status.id_product_status,
-            name=db_status.status_name,
-            created_at=db_status.created_at,
-            updated_at=db_status.updated_at,
-        ).dict()
-
-
-@shared_task
-def add_product_status(name: str):
-    """Add product status to database"""
-    with Session() as session:
-        # Before adding a new status, we should confirm that there is no status
-        # with the same name in the database. This is a business rule that
-        # should be enforced.
-        db_status = session.scalar(
-            select(models.ProductStatus)
-            .where(models.ProductStatus.status_name == name)
-        )
-        if db_status:
-            raise ValueError(
-                f"product status '{name}' already exists in the database.")
-
-        new_status = models.ProductStatus(status_name=name)
-        session.add(new_status)
-        session.commit()
-        return new_status.id_product_status
-
-
-@shared_task
-def update_product_status(id_product_status: int, name: str):
-    """Update product status by id_product_status"""
-    with Session() as session:
-        db_status = session.scalar(
-            select(models.ProductStatus)
-            .where(models.ProductStatus.id_product_status == id_product_status)
-        )
-        if not db_status:
-            raise ValueError(
-                f"product status with ID {id_product_status} not found.")
-        db_status.status_name = name
-        session.commit()
-        return id_product_status
-
-
-@shared_task
-def delete_product_status(id_product_status: int):
-    """Delete product status by id_product_status"""
-    with Session() as session:
-        db_status = session.scalar(
-            select(models.ProductStatus)
-            .where(models.ProductStatus.id_product_status == id_product_status)
-        )
-        if not db_status:
-            raise ValueError(
-                f"product status with ID {id_product_status} not found.")
-        session.delete(db_status)
-        session.commit()
-        return id_product_status
-
-
-@shared_task
-def get_locations():
-    """Get locations from database"""
-    with Session() as session:
-        db_locations = session.scalars(select(models.Location)).all()
-        locations = [
-            schemas.LocationBase(
-                id=db_location.id_location,
-                name=db_location.location_name,
-                created_at=db_location.created_at,
-                updated_at=db_location.updated_at,
-            ).dict()
-            for db_location in db_locations
-        ]
-        return schemas.GetLocationsResponse(locations=locations).dict()
-
-
-@shared_task
-def get_location(location_id: int):
-    """Get location from database"""
-    with Session() as session:
-        db_location = session.scalar(
-            select(models.Location)
-            .where(models.Location.id_location == location_id)
-        )
-        if not db_location:
-            raise ValueError(f"Location with ID {location_id} not found.")
-        return schemas.LocationBase(
-            id=db_location.id_location,
-            name=db_location.location_name,
-            created_at=db_location.created_at,
-            updated_at=db_location.updated_at,
-        ).dict()
-
-
-@shared_task
-def add_location(name: str):
-    """Add location to database"""
-    with Session() as session:
-        # Before adding a new location, we should confirm that there is no
-        # location with the same name in the database. This is a business rule
-        # that should be enforced.
-        db_location = session.scalar(
-            select(models.Location)
-            .where(models.Location.location_name == name)
-        )
-        if db_location:
-            raise ValueError(
-                f"Location '{name}' already exists in the database.")
-
-        new_location = models.Location(location_name=name)
-        session.add(new_location)
-        session.commit()
-        return new_location.id_location
-
-
-@shared_task
-def update_location(location_id: int, name: str):
-    """Update location by location_id"""
-    with Session() as session:
-        db_location = session.scalar(
-            select(models.Location)
-            .where(models.Location.id_location == location_id)
-        )
-        if not db_location:
-            raise ValueError(f"Location with ID {location_id} not found.")
-        db_location.location_name = name
-        session.commit()
-        return location_id
-
-
-@shared_task
-def delete_location(location_id: int):
-    """Delete location by location_id"""
-    with Session() as session:
-        db_location = session.scalar(
-            select(models.Location)
-            .where(models.Location.id_location == location_id)
-        )
-        if not db_location:
-            raise ValueError(f"Location with ID {location_id} not found.")
-        session.delete(db_location)
-        session.commit()
-        return location_id
-
+def get_products(
+    shipping_group_name: str | None = None,
+    status: str | None = None,
+    location: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    after_id: int | None = None,
+    limit: int = queries.DEFAULT_PAGE_SIZE,
+):
+    """Get a page of products from database
 
-@shared_task
-def get_products(shipping_group_name: str | None = None):
-    """Get products from database"""
+    Only the requested page is read, starting after the product `after_id`.
+    """
+    limit = min(limit, queries.MAX_PAGE_SIZE)
     with Session() as session:
         # Before fetching the products, we need to confirm that
         # shipping_group_name is valid (If entered),
-        db_shipping_group = None  # Initialize as None
+        id_shipping_group = None  # Initialize as None
 
         if shipping_group_name:
-            db_shipping_group = get_shipping_group_by_name(
+            id_shipping_group = get_shipping_group_id_by_name(
                 session=session,
                 shipping_group_name=shipping_group_name,
             )
-        # Main query to fetch the required fields, including the "profit"
+        # Main query to fetch the required fields, including the "profit".
+        # One extra row is requested to know if there is a next page.
         query = queries.get_product_query(
-            session=session,
-            id_shipping_group=db_shipping_group.id_shipping_group if shipping_group_name else None,
+            id_shipping_group=id_shipping_group,
+            status=status,
+            location=location,
+            min_price=min_price,
+            max_price=max_price,
+            after_id=after_id,
+            limit=limit + 1,
         )
-
-        products = [
-            schemas.ProductDetailResponse(
-                id_product=db_product.id_product,
-                description=db_product.description,
-                shipping_label=db_product.shipping_label,
-                purchase_price=db_product.purchase_price,
-                shipping_group=db_product.shipping_group_name,
-                status=db_product.status_name,
-                location_name=db_product.location_name,
-                purchase_price_mxn=db_product.purchase_price_mxn,
-                sale_price=db_product.sale_price,
-                profit=db_product.profit,
-            ).dict()
-            for db_product in query.all()
-        ]
-        return schemas.GetProductsDetailResponse(
-            products=products,
-            num_products=len(products),
-        ).dict()
+        result = session.execute(query)
+        db_products = result.all()
+        next_cursor = None
+        if len(db_products) > limit:
+            db_products = db_products[:limit]
+            next_cursor = db_products[-1].id_product
+        return build_products_response(
+            crud.rows_as_dicts(result.keys(), db_products), next_cursor)
 
 
 @shared_task
@@ -231,23 +131,13 @@ def get_product(product_id: int):
     """Get product from database"""
     # Same as get_products, but with a filter by product_id in the query
     with Session() as session:
-        query = queries.get_product_query(session, product_id)
+        query = queries.get_product_query(product_id)
 
-        if not (db_product := query.first()):
+        if not (db_product := session.execute(query).first()):
             raise ValueError(f"product with ID {product_id} not found.")
 
-        return schemas.ProductDetailResponse(
-            id_product=db_product.id_product,
-            description=db_product.description,
-            shipping_label=db_product.shipping_label,
-            purchase_price=db_product.purchase_price,
-            shipping_group=db_product.shipping_group_name,
-            status=db_product.status_name,
-            location_name=db_product.location_name,
-            purchase_price_mxn=db_product.purchase_price_mxn,
-            profit=db_product.profit,
-            sale_price=db_product.sale_price,
-        ).dict()
+        return schemas.ProductDetailResponse.model_validate(
+            db_product).model_dump()
 
 
 @shared_task
@@ -257,31 +147,20 @@ def get_product_by_shipping_group_and_label(
 ):
     """Get product by shipping group and label"""
     with Session() as session:
-        db_shipping_group = get_shipping_group_by_name(
+        id_shipping_group = get_shipping_group_id_by_name(
             session=session,
             shipping_group_name=shipping_group_name,
         )
         query = queries.get_product_query(
-            session=session,
-            id_shipping_group=db_shipping_group.id_shipping_group,
+            id_shipping_group=id_shipping_group,
             shipping_label=shipping_label,
         )
-        if not (db_product := query.first()):
+        if not (db_product := session.execute(query).first()):
             raise ValueError(
                 f"product with shipping label '{shipping_label}' not found " +
                 f"in the shipping group '{shipping_group_name}'.")
-        return schemas.ProductDetailResponse(
-            id_product=db_product.id_product,
-            description=db_product.description,
-            shipping_label=db_product.shipping_label,
-            purchase_price=db_product.purchase_price,
-            shipping_group=db_product.shipping_group_name,
-            status=db_product.status_name,
-            location_name=db_product.location_name,
-            purchase_price_mxn=db_product.purchase_price_mxn,
-            profit=db_product.profit,
-            sale_price=db_product.sale_price,
-        ).dict()
+        return schemas.ProductDetailResponse.model_validate(
+            db_product).model_dump()
 
 
 @shared_task
@@ -295,19 +174,19 @@ def add_product(
 ):
     """Add product to database"""
     with Session() as session:
-        # Initalizing db_shipping_group as None
-        db_shipping_group = None
+        # Initalizing id_shipping_group as None
+        id_shipping_group = None
 
         if shipping_group_name:
-            db_shipping_group = get_shipping_group_by_name(
+            id_shipping_group = get_shipping_group_id_by_name(
                 session=session,
                 shipping_group_name=shipping_group_name,
             )
-        db_location = queries.get_product_location_by_name(
+        id_location = queries.get_product_location_id_by_name(
             session=session,
             location_name=product_location,
         )
-        db_product_status = queries.get_product_status_by_name(
+        id_product_status = queries.get_product_status_id_by_name(
             session=session,
             status_name=product_status,
         )
@@ -315,15 +194,180 @@ def add_product(
             description=description,
             shipping_label=shipping_label,
             purchase_price=purchase_price,
-            id_product_status=db_product_status.id_product_status,
-            id_location=db_location.id_location,
-            id_shipping_group=db_shipping_group.id_shipping_group if shipping_group_name else None,
+            id_product_status=id_product_status,
+            id_location=id_location,
+            id_shipping_group=id_shipping_group,
         )
         session.add(new_product)
-        session.commit()
+        if id_shipping_group is not None:
+            queries.update_product_count(session, id_shipping_group, 1)
+        commit_unique(
+            session,
+            f"product with shipping label '{shipping_label}' already exists "
+            f"in the shipping group '{shipping_group_name}'.",
+        )
+        response_cache.invalidate(models.Product.__tablename__)
         return new_product.id_product
 
 
+# Products inserted by each INSERT statement of an import
+IMPORT_CHUNK_SIZE = 1000
+
+
+def _parse_import_items(products: list[dict], errors: list) -> dict:
+    """Validate the products of an import, by their position in the list
+
+    The products that are not valid are reported in `errors`.
+    """
+    items = {}
+    for row, product in enumerate(products):
+        try:
+            items[row] = schemas.ProductImportItem(**product)
+        except ValidationError as exc:
+            message = "; ".join(
+                f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                for error in exc.errors()
+            )
+            errors.append(schemas.ProductImportError(row=row, message=message))
+    return items
+
+
+def _resolve_import_items(session, items: dict, errors: list) -> dict:
+    """Return the values of the new products, by their position in the list
+
+    The names of the locations, statuses and shipping groups are resolved
+    once for the whole batch. The products with a name that is not found
+    are reported in `errors`.
+    """
+    location_ids = queries.get_ids_by_name(
+        session,
+        models.Location.location_name,
+        models.Location.id_location,
+        [item.product_location for item in items.values()],
+    )
+    status_ids = queries.get_ids_by_name(
+        session,
+        models.ProductStatus.status_name,
+        models.ProductStatus.id_product_status,
+        [item.product_status for item in items.values()],
+    )
+    shipping_group_ids = queries.get_ids_by_name(
+        session,
+        ShippingGroup.shipping_group_name,
+        ShippingGroup.id_shipping_group,
+        [item.shipping_group_name for item in items.values()
+         if item.shipping_group_name],
+    )
+
+    new_products = {}
+    for row, item in items.items():
+        if item.product_location not in location_ids:
+            message = f"Location '{item.product_location}' not found."
+        elif item.product_status not in status_ids:
+            message = f"Status '{item.product_status}' not found."
+        elif (item.shipping_group_name and
+              item.shipping_group_name not in shipping_group_ids):
+            message = f"Shipping group '{item.shipping_group_name}' not found."
+        else:
+            new_products[row] = {
+                "description": item.description,
+                "shipping_label": item.shipping_label,
+                "purchase_price": item.purchase_price,
+                "id_product_status": status_ids[item.product_status],
+                "id_location": location_ids[item.product_location],
+                "id_shipping_group": shipping_group_ids.get(
+                    item.shipping_group_name),
+            }
+            continue
+        errors.append(schemas.ProductImportError(row=row, message=message))
+    return new_products
+
+
+def _remove_duplicates(session, new_products: dict, items: dict, errors: list):
+    """Remove the products whose shipping label is already used in their group
+
+    The label can be repeated in the batch, in which case the first product
+    is kept, or already exist in the database, which is checked for the
+    whole batch in one query. The removed products are reported in `errors`.
+    """
+    def key(product):
+        return product["id_shipping_group"], product["shipping_label"]
+
+    # The products without shipping group can share a label
+    grouped_rows = [
+        row for row, product in new_products.items()
+        if product["id_shipping_group"] is not None
+    ]
+    existing = queries.get_existing_shipping_labels(
+        session, [key(new_products[row]) for row in grouped_rows])
+    first_rows = {}
+    for row in grouped_rows:
+        product_key = key(new_products[row])
+        item = items[row]
+        if product_key in existing:
+            message = (
+                f"product with shipping label '{item.shipping_label}' already "
+                f"exists in the shipping group '{item.shipping_group_name}'.")
+        elif product_key in first_rows:
+            message = (
+                f"Shipping label '{item.shipping_label}' is repeated in the "
+                f"shipping group '{item.shipping_group_name}' "
+                f"(row {first_rows[product_key]}).")
+        else:
+            first_rows[product_key] = row
+            continue
+        del new_products[row]
+        errors.append(schemas.ProductImportError(row=row, message=message))
+
+
+def _insert_products(session, new_products: list[dict]):
+    """Insert the products in chunks and add them to their group counts"""
+    for start in range(0, len(new_products), IMPORT_CHUNK_SIZE):
+        session.execute(
+            insert(models.Product),
+            new_products[start:start + IMPORT_CHUNK_SIZE],
+        )
+    group_counts = Counter(
+        product["id_shipping_group"] for product in new_products
+        if product["id_shipping_group"] is not None
+    )
+    for id_shipping_group, count in group_counts.items():
+        queries.update_product_count(session, id_shipping_group, count)
+
+
+@shared_task
+def import_products(products: list[dict]):
+    """Add many products to database in a single transaction
+
+    The names of the locations, statuses and shipping groups are resolved
+    once for the whole batch, and the products are inserted with executemany
+    in chunks of IMPORT_CHUNK_SIZE. Rows that can't be imported, including
+    the ones with a shipping label that is repeated in their shipping group,
+    are skipped and reported in the errors of the response, with their
+    position in the list.
+    """
+    errors = []
+    items = _parse_import_items(products, errors)
+    with Session() as session:
+        new_products = _resolve_import_items(session, items, errors)
+        _remove_duplicates(session, new_products, items, errors)
+        if new_products:
+            _insert_products(session, list(new_products.values()))
+            # Only a product added by another task at the same time can
+            # still be a duplicate here
+            commit_unique(
+                session,
+                "Some products already exist in their shipping group "
+                "with the same shipping label.",
+            )
+            response_cache.invalidate(models.Product.__tablename__)
+
+        return schemas.ImportProductsResponse(
+            num_products=len(new_products),
+            errors=sorted(errors, key=lambda error: error.row),
+        ).model_dump()
+
+
 @shared_task
 def update_product(
     product_id: int,
@@ -335,45 +379,48 @@ def update_product(
     id_location: int | None = None,
     id_shipping_group: int | None = None,
 ):
-    """Update product by product_id"""
+    """Update product by product_id
+
+    Only the fields that are not None are updated, in a single UPDATE
+    statement without loading the product.
+    """
+    values = {
+        column: value
+        for column, value in (
+            ("description", description),
+            ("shipping_label", shipping_label),
+            ("purchase_price", purchase_price),
+            ("sale_price", sale_price),
+            ("id_product_status", id_product_status),
+            ("id_location", id_location),
+            ("id_shipping_group", id_shipping_group),
+        )
+        if value is not None
+    }
+    # If all fields are None, the product will not be updated. This
+    # should trigger a validation error in the API.
+    if not values:
+        raise ValueError("No fields to update.")
     with Session() as session:
-        db_product = session.scalar(
-            select(models.Product)
+        if id_shipping_group is not None:
+            # Move the product to the new group also in the product counts
+            queries.move_product_count(session, product_id, id_shipping_group)
+        result = execute_unique(
+            session,
+            update(models.Product)
             .where(models.Product.id_product == product_id)
+            .values(**values)
+            .execution_options(synchronize_session=False),
+            "A product with the same shipping label already exists "
+            "in the shipping group.",
         )
-        if not db_product:
+        if not result.rowcount:
             raise ValueError(f"product with ID {product_id} not found.")
-        # Only update the fields that are not None in the request.
-        # If all fields are None, the product will not be updated. This is
-        # should trigger a validation error in the API.
-        item_modifications = 0
-        if description is not None:
-            db_product.description = description
-            item_modifications += 1
-        if shipping_label is not None:
-            db_product.shipping_label = shipping_label
-            item_modifications += 1
-        if purchase_price is not None:
-            db_product.purchase_price = purchase_price
-            item_modifications += 1
-        if sale_price is not None:
-            db_product.sale_price = sale_price
-            item_modifications += 1
-        if id_product_status is not None:
-            db_product.id_product_status = id_product_status
-            item_modifications += 1
-        if id_location is not None:
-            db_product.id_location = id_location
-            item_modifications += 1
-        if id_shipping_group is not None:
-            db_product.id_shipping_group = id_shipping_group
-            item_modifications += 1
-        if item_modifications == 0:
-            raise ValueError("No fields to update.")
         session.commit()
+        response_cache.invalidate(models.Product.__tablename__)
         return schemas.UpdateproductResponse(
-            id=product_id, updated_items=item_modifications
-        ).dict()
+            id=product_id, updated_items=len(values)
+        ).model_dump()
 
 
 @shared_task
@@ -386,69 +433,95 @@ def update_product_by_shipping_group_and_label(
     location: str | None = None,
     status: str | None = None,
 ):
-    """Update product by shipping group and label"""
+    """Update product by shipping group and label
+
+    Only the fields that are not None are updated, in a single UPDATE
+    statement by the shipping group and the label, without loading the
+    product. The IDs of the names are read from the reference cache.
+    """
+    values = {
+        column: value
+        for column, value in (
+            ("description", description),
+            ("purchase_price", purchase_price),
+            ("sale_price", sale_price),
+        )
+        if value is not None
+    }
+    if location is None and status is None and not values:
+        raise ValueError("No fields to update.")
     with Session() as session:
-        db_shipping_group = get_shipping_group_by_name(
+        id_shipping_group = get_shipping_group_id_by_name(
             session=session,
             shipping_group_name=shipping_group_name,
         )
-        db_product = session.scalar(
-            select(models.Product)
-            .where(
-                models.Product.shipping_label == shipping_label,
-                models.Product.id_shipping_group == db_shipping_group.id_shipping_group
-            )
-        )
-        # Only update the fields that are not None in the request.
-        # If all fields are None, the product will not be updated. This is
-        # should trigger a validation error in the API.
-        item_modifications = 0
-        if description is not None:
-            db_product.description = description
-            item_modifications += 1
-        if purchase_price is not None:
-            db_product.purchase_price = purchase_price
-            item_modifications += 1
-        if sale_price is not None:
-            db_product.sale_price = sale_price
-            item_modifications += 1
         if location is not None:
-            db_location = queries.get_product_location_by_name(
+            values["id_location"] = queries.get_product_location_id_by_name(
                 session=session,
                 location_name=location,
             )
-            db_product.id_location = db_location.id_location
-            item_modifications += 1
         if status is not None:
-            db_status = queries.get_product_status_by_name(
-                session=session,
-                status_name=status,
+            values["id_product_status"] = (
+                queries.get_product_status_id_by_name(
+                    session=session,
+                    status_name=status,
+                ))
+        result = session.execute(
+            update(models.Product)
+            .where(
+                models.Product.shipping_label == shipping_label,
+                models.Product.id_shipping_group == id_shipping_group
+            )
+            # MySQL only: LAST_INSERT_ID(expr) returns expr and stores it as
+            # the value of LAST_INSERT_ID() of the connection, which the
+            # driver reports as the last row ID of the statement. Setting
+            # the ID to itself this way changes nothing, and gives the ID of
+            # the updated product without selecting it.
+            .values(
+                id_product=func.last_insert_id(models.Product.id_product),
+                **values,
             )
-            db_product.id_product_status = db_status.id_product_status
-            item_modifications += 1
-        if item_modifications == 0:
-            raise ValueError("No fields to update.")
+            .execution_options(synchronize_session=False)
+        )
+        # SQLAlchemy connects to MySQL with the FOUND_ROWS flag, so the
+        # row count is of the matched rows, even if nothing changed
+        if not result.rowcount:
+            raise ValueError(
+                f"product with shipping label '{shipping_label}' not found "
+                f"in the shipping group '{shipping_group_name}'.")
         session.commit()
+        response_cache.invalidate(models.Product.__tablename__)
         return schemas.UpdateproductResponse(
-            id=db_product.id_product, updated_items=item_modifications
-        ).dict()
+            id=result.lastrowid, updated_items=len(values)
+        ).model_dump()
 
 
 @shared_task
 def delete_product(product_id: int):
     """Delete product by product_id"""
     with Session() as session:
-        db_product = session.scalar(
-            select(models.Product)
-            .where(models.Product.id_product == product_id)
-        )
-        if not db_product:
-            raise ValueError(f"product with ID {product_id} not found.")
-        session.delete(db_product)
+        queries.remove_product_counts(session, [product_id])
+        crud.delete_by_id(session, models.Product, product_id, "product")
         session.commit()
+        response_cache.invalidate(models.Product.__tablename__)
         return product_id
 
 
+@shared_task
+def delete_products(product_ids: list[int]):
+    """Delete many products by their IDs
+
+    The products that are found are deleted in a single DELETE statement,
+    and the IDs that are not found are reported in the response.
+    """
+    with Session() as session:
+        queries.remove_product_counts(session, product_ids)
+        response = crud.delete_by_ids(session, models.Product, product_ids)
+        session.commit()
+        response_cache.invalidate(models.Product.__tablename__)
+        return response.model_dump()
+
+
 @shared_task
 def add_sale_price(
         shipping_group_name: str,
@@ -459,7 +532,7 @@ def add_sale_price(
     with Session() as session:
         # Before adding a new sale price, we should confirm that the
         # shipping_group_name is valid.
-        db_shipping_group = get_shipping_group_by_name(
+        id_shipping_group = get_shipping_group_id_by_name(
             session=session,
             shipping_group_name=shipping_group_name,
         )
@@ -468,7 +541,7 @@ def add_sale_price(
             select(models.Product)
             .where(
                 models.Product.shipping_label == shipping_label,
-                models.Product.id_shipping_group == db_shipping_group.id_shipping_group
+                models.Product.id_shipping_group == id_shipping_group
             )
         )
         if not db_product:
@@ -477,4 +550,54 @@ def add_sale_price(
                 "in the shipping group '{shipping_group_name}'.")
         db_product.sale_price = sale_price
         session.commit()
+        response_cache.invalidate(models.Product.__tablename__)
         return db_product.id_product
+
+
+@shared_task
+def add_sale_prices(
+        shipping_group_name: str,
+        sale_prices: dict[str, float],
+):
+    """Add the sale prices of many products of a shipping group
+
+    `sale_prices` maps the shipping labels to their sale price. All the
+    prices are set in a single UPDATE statement, and the labels that are not
+    found in the shipping group are reported in the response.
+    """
+    with Session() as session:
+        id_shipping_group = get_shipping_group_id_by_name(
+            session=session,
+            shipping_group_name=shipping_group_name,
+        )
+        in_shipping_group = (
+            models.Product.id_shipping_group == id_shipping_group
+        )
+        found_labels = set(session.scalars(
+            select(models.Product.shipping_label)
+            .where(
+                in_shipping_group,
+                models.Product.shipping_label.in_(sale_prices),
+            )
+        ).all())
+        if found_labels:
+            result = session.execute(
+                update(models.Product)
+                .where(
+                    in_shipping_group,
+                    models.Product.shipping_label.in_(found_labels),
+                )
+                .values(sale_price=case(
+                    {label: sale_prices[label] for label in found_labels},
+                    value=models.Product.shipping_label,
+                ))
+            )
+            num_products = result.rowcount
+        else:
+            num_products = 0
+        session.commit()
+        response_cache.invalidate(models.Product.__tablename__)
+        return schemas.AddSalePricesResponse(
+            num_products=num_products,
+            not_found=sorted(set(sale_prices) - found_labels),
+        ).model_dump()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""In-process cache for the reference tables.
+
+Statuses, locations, shippers, sellers and shipping groups are small tables
+that rarely change, but they are looked up on almost every product read and
+write. This module keeps name -> ID and ID -> row mappings of those tables in
+memory, with a TTL and a maximum number of entries per table.
+
+The add/update/delete tasks of a table must call `invalidate` after their
+commit. The invalidation is published on Redis, so the caches of every
+process (API and Celery workers) are cleared, not only the local one.
+"""
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+import redis
+from celery_worker import REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL = float(os.getenv("REFERENCE_CACHE_TTL", "300"))
+CACHE_SIZE = int(os.getenv("REFERENCE_CACHE_SIZE", "1024"))
+
+# Redis channel where the invalidated table names are published
+INVALIDATION_CHANNEL = "tienda:reference-cache:invalidate"
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Incremented on every clear, so a value loaded before a clear is
+        # not stored after it
+        self.generation = 0
+
+    def get(self, key, default=None):
+        """Return the value of `key`, or `default` if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, generation=None):
+        """Store `value` in `key`, evicting the least recently used entry.
+
+        If `generation` is given and the cache was cleared since then, the
+        value is discarded.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all the entries."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+
+_redis = redis.Redis.from_url(REDIS_URL)
+
+# One cache per table name
+_caches: dict[str, TTLCache] = {}
+# Process ID and thread of the invalidation listener
+_listener = {"pid": None, "thread": None}
+_listener_lock = threading.Lock()
+
+
+def _get_cache(table: str) -> TTLCache:
+    """Return the cache of a table, starting the invalidation listener."""
+    _start_listener()
+    if table not in _caches:
+        _caches.setdefault(table, TTLCache())
+    return _caches[table]
+
+
+def _listen_invalidations():
+    """Clear the local caches of the tables invalidated by other processes."""
+    while True:
+        try:
+            pubsub = _redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            # Invalidations could have been missed while disconnected
+            clear_all()
+            for message in pubsub.listen():
+                table = message["data"].decode()
+                if table in _caches:
+                    _caches[table].clear()
+        except redis.RedisError as exc:
+            logger.warning("Reference cache listener disconnected: %s", exc)
+            clear_all()
+            time.sleep(1)
+
+
+def _start_listener():
+    """Start the invalidation listener of this process, if not running.
+
+    The listener is started on first use and per process ID, so every
+    Celery prefork child starts its own after the fork.
+    """
+    if _listener["pid"] == os.getpid():
+        return
+    with _listener_lock:
+        if _listener["pid"] == os.getpid():
+            return
+        thread = threading.Thread(
+            target=_listen_invalidations,
+            name="reference-cache-listener",
+            daemon=True,
+        )
+        thread.start()
+        _listener.update(pid=os.getpid(), thread=thread)
+
+
+def get_or_load(table: str, key, loader):
+    """Return the cached value of `key` in `table`, loading it if missing.
+
+    `loader` is called without arguments on a cache miss. None is never
+    cached, so a missing row is looked up again on the next call.
+    """
+    cache = _get_cache(table)
+    value = cache.get(key)
+    if value is None:
+        generation = cache.generation
+        value = loader()
+        if value is not None:
+            cache.set(key, value, generation)
+    return value
+
+
+def clear_all():
+    """Clear the local caches of all the tables."""
+    for cache in list(_caches.values()):
+        cache.clear()
+
+
+def invalidate(table: str):
+    """Clear the cache of a table in this and every other process."""
+    if table in _caches:
+        _caches[table].clear()
+    try:
+        _redis.publish(INVALIDATION_CHANNEL, table)
+    except redis.RedisError as exc:
+        # The other processes will refresh the table when the TTL expires
+        logger.warning("Could not publish the invalidation of %s: %s", table, exc)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Redis cache of the responses of the read endpoints.
+
+A cached endpoint is keyed by its name and the values of its parameters,
+and tagged with the tables it reads. Every tag has a version number in
+Redis, which is part of the key of the entries, so a write invalidates all
+the entries of a table with a single INCR: the old entries are no longer
+reachable and expire after their TTL.
+
+Because the versions are read before running the endpoint, a response
+computed while a write was committed is stored under the old versions and
+is never served.
+
+The tasks that change a table must call `invalidate` after their commit.
+"""
+import os
+import json
+import hashlib
+import logging
+import secrets
+import functools
+from collections import Counter
+import redis
+import redis.asyncio
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from celery_worker import REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+# Seconds a response is kept, even if none of its tables change
+CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "60"))
+
+KEY_PREFIX = "tienda:response-cache"
+
+# Used by the API to read and store the responses
+_async_redis = redis.asyncio.Redis.from_url(REDIS_URL)
+# Used by the tasks to invalidate the tags
+_redis = redis.Redis.from_url(REDIS_URL)
+
+
+class CacheMetrics:
+    """Hit and miss counters of the cached endpoints.
+
+    Errors are the requests that could not use Redis and were served
+    without the cache.
+    """
+
+    def __init__(self):
+        self.hits = Counter()
+        self.misses = Counter()
+        self.errors = Counter()
+
+    def as_dict(self) -> dict:
+        """Return the counters of every endpoint as a dictionary."""
+        endpoints = sorted(set(self.hits) | set(self.misses) | set(self.errors))
+        return {
+            endpoint: {
+                "hits": self.hits[endpoint],
+                "misses": self.misses[endpoint],
+                "errors": self.errors[endpoint],
+            }
+            for endpoint in endpoints
+        }
+
+
+# Counters of this API process
+metrics = CacheMetrics()
+
+
+def _tag_key(tag: str) -> str:
+    return f"{KEY_PREFIX}:tag:{tag}"
+
+
+def _entry_key(endpoint: str, params: dict, versions: list) -> str:
+    digest = hashlib.sha1(
+        json.dumps([params, versions], sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"{KEY_PREFIX}:entry:{endpoint}:{digest}"
+
+
+def _new_version() -> int:
+    """Return the first version of a tag, at random.
+
+    The version of a tag is set with an expiration of CACHE_TTL, which the
+    increments of `invalidate` keep. So every version, and the ETags built
+    from it (see etag.py), last at most CACHE_TTL, even if an invalidation
+    is lost or a table is changed without calling `invalidate`.
+    """
+    return secrets.randbelow(2 ** 62)
+
+
+async def get_versions(*tags: str) -> list[bytes]:
+    """Return the current version of each tag, in a single MGET.
+
+    A tag without version gets a random one, so the versions never start
+    again from a value that was already used. It expires after CACHE_TTL
+    (see `_new_version`).
+
+    Raises:
+        redis.RedisError: If Redis is not available.
+    """
+    tag_keys = [_tag_key(tag) for tag in tags]
+    versions = await _async_redis.mget(tag_keys)
+    if None not in versions:
+        return versions
+    async with _async_redis.pipeline(transaction=False) as pipe:
+        for tag_key, version in zip(tag_keys, versions):
+            if version is None:
+                pipe.set(tag_key, _new_version(), nx=True, ex=CACHE_TTL)
+        await pipe.execute()
+    return await _async_redis.mget(tag_keys)
+
+
+def cached(*tags: str):
+    """Decorator to cache the response of an endpoint in Redis.
+
+    The decorator must be placed below the route decorator, so FastAPI
+    still sees the parameters of the endpoint. The response must be JSON
+    serializable with `jsonable_encoder`, or a JSON `Response`.
+
+    The cached responses are returned as they were stored, without being
+    validated again against the response model.
+
+    Args:
+        *tags: Names of the tables read by the endpoint.
+    """
+    def decorator(endpoint):
+        name = f"{endpoint.__module__}.{endpoint.__name__}"
+
+        @functools.wraps(endpoint)
+        async def wrapper(**params):
+            try:
+                versions = await get_versions(*tags)
+                key = _entry_key(name, params, versions)
+                data = await _async_redis.get(key)
+            except redis.RedisError as exc:
+                logger.warning("Response cache unavailable: %s", exc)
+                metrics.errors[name] += 1
+                return await endpoint(**params)
+
+            if data is not None:
+                metrics.hits[name] += 1
+                return Response(content=data, media_type="application/json")
+
+            metrics.misses[name] += 1
+            response = await endpoint(**params)
+            if isinstance(response, Response):
+                body = response.body
+            else:
+                body = json.dumps(jsonable_encoder(response))
+            try:
+                await _async_redis.set(key, body, ex=CACHE_TTL)
+            except redis.RedisError as exc:
+                logger.warning("Could not store the response of %s: %s", name, exc)
+            return response
+
+        return wrapper
+    return decorator
+
+
+def invalidate(*tags: str):
+    """Invalidate the cached responses that read any of the given tables."""
+    try:
+        with _redis.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(_tag_key(tag))
+            versions = pipe.execute()
+            # The tag had no version, see get_versions
+            for tag, version in zip(tags, versions):
+                if version == 1:
+                    pipe.set(_tag_key(tag), _new_version(), ex=CACHE_TTL)
+            pipe.execute()
+    except redis.RedisError as exc:
+        # The responses and the ETags will be refreshed when the versions
+        # of their tags expire
+        logger.warning("Could not invalidate the responses of %s: %s", tags, exc)
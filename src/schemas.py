@@ -7,3 +7,10 @@ class TaskId(BaseModel):
     """Schema for a task id."""
 
     task_id: str
+
+
+class BulkDeleteResponse(BaseModel):
+    """Schema of the result of a bulk delete."""
+
+    num_deleted: int
+    not_found: list[int]
@@ -11,4 +11,4 @@ class Seller(Base):
     __tablename__ = 'sellers'
 
     id_seller = Column(Integer, primary_key=True)
-    seller_name = Column("seller_name", String, nullable=False)
+    seller_name = Column("seller_name", String(255), nullable=False, unique=True)
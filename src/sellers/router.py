@@ -2,8 +2,11 @@
 """FastAPI router related to group1."""
 from fastapi import APIRouter
 from schemas import TaskId
+import crud_router
+import etag
 from . import tasks
 from . import schemas
+from . import models
 
 router = APIRouter()
 
@@ -49,36 +52,25 @@ async def get_task_result(task_id: str):
     return {"status": "SUCCESS", "result": task.get()}
 
 
-@router.get("/get-sellers")
-async def get_sellers() -> schemas.GetSellersResponse:
-    """Get sellers in tienda"""
-    task = tasks.get_sellers.delay()
-    return task.get()
-
-
-@router.get("/get-seller/{seller_id}")
-async def get_seller(seller_id: int) -> schemas.SellerBase:
-    """Get seller by ID"""
-    task = tasks.get_seller.delay(seller_id)
-    return task.get()
-
-
-@router.post("/add-seller")
-async def add_seller(name: str) -> schemas.AddSellerResponse:
-    """Add a new seller"""
-    task = tasks.add_seller.delay(name)
-    return task.get()
-
-
-@router.put("/update-seller/{seller_id}")
-async def update_seller(seller_id: int, name: str):
-    """Update a seller"""
-    task = tasks.update_seller.delay(seller_id, name)
-    return task.get()
-
-
-@router.delete("/delete-seller/{seller_id}")
-async def delete_seller(seller_id: int):
-    """Delete a seller"""
-    task = tasks.delete_seller.delay(seller_id)
-    return task.get()
+routes = crud_router.Routes(router, __name__)
+routes.get_all(
+    tasks.sellers, "/get-sellers", schemas.GetSellersResponse,
+    "Get sellers in tienda",
+    dependencies=[etag.conditional(models.Seller)],
+)
+routes.get_one(
+    tasks.sellers, "/get-seller/{seller_id}", schemas.SellerBase,
+    "Get seller by ID",
+)
+routes.add(
+    tasks.sellers, "/add-seller", schemas.AddSellerResponse,
+    "Add a new seller",
+)
+routes.update(
+    tasks.sellers, "/update-seller/{seller_id}", int, "Update a seller")
+routes.delete(
+    tasks.sellers, "/delete-seller/{seller_id}", int, "Delete a seller")
+routes.delete_many(
+    tasks.sellers, "/delete-sellers",
+    "Delete many sellers at once\n\nThe body is the list of seller IDs.",
+)
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Compact serialization of the task results.
+
+The "msgpack-compact" serializer is a binary alternative to the JSON
+serializer of Celery for the task results. Like the JSON serializer, it
+converts datetimes to ISO 8601 strings and decimals to floats, so the API
+gets the same values with both. Select it with the TASK_RESULT_SERIALIZER
+setting (see celery_worker.py); the API and the workers must use the same.
+"""
+import decimal
+import datetime
+import msgpack
+from kombu.serialization import register
+
+SERIALIZER_NAME = "msgpack-compact"
+CONTENT_TYPE = "application/x-msgpack-compact"
+
+
+def _default(obj):
+    """Convert the values that msgpack can't pack"""
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} can't be packed")
+
+
+def dumps(value) -> bytes:
+    """Pack a value with msgpack"""
+    return msgpack.packb(value, default=_default, use_bin_type=True)
+
+
+def loads(data: bytes):
+    """Unpack a value packed with `dumps`"""
+    return msgpack.unpackb(data, raw=False)
+
+
+register(
+    SERIALIZER_NAME,
+    dumps,
+    loads,
+    content_type=CONTENT_TYPE,
+    content_encoding="binary",
+)
@@ -12,7 +12,7 @@ class Shipper(Base):
     __tablename__ = 'shippers'
 
     id_shipper = Column(Integer, primary_key=True)
-    shipper_name = Column("shipper_name", String, nullable=False)
+    shipper_name = Column("shipper_name", String(255), nullable=False, unique=True)
 
     # Relationships
     shipping_groups = relationship("ShippingGroup", back_populates="shipper")
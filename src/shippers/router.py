@@ -1,42 +1,29 @@
 #!/usr/bin/env python
 """Router for the API for shippers"""
 from fastapi import APIRouter
+import crud_router
+import etag
 from . import schemas
 from . import tasks
+from . import models
 
 router = APIRouter()
-
-
-@router.get("/get-shippers")
-async def get_shippers() -> schemas.GetShippersResponse:
-    """Get all shippers"""
-    task = tasks.get_shippers.delay()
-    return task.get()
-
-
-@router.get("/get-shippers/{shipper_id}")
-async def get_shipper(shipper_id: int) -> schemas.ShipperBase:
-    """Get a shipper"""
-    task = tasks.get_shipper.delay(shipper_id)
-    return task.get()
-
-
-@router.post("/add-shipper")
-async def add_shipper(name: str) -> int:
-    """Add a shipper"""
-    task = tasks.add_shipper.delay(name)
-    return task.get()
-
-
-@router.put("/update-shipper/{shipper_id}")
-async def update_shipper(shipper_id: int, name: str) -> int:
-    """Update a shipper"""
-    task = tasks.update_shipper.delay(shipper_id, name)
-    return task.get()
-
-
-@router.delete("/delete-shipper/{shipper_id}")
-async def delete_shipper(shipper_id: int) -> int:
-    """Delete a shipper"""
-    task = tasks.delete_shipper.delay(shipper_id)
-    return task.get()
+routes = crud_router.Routes(router, __name__)
+routes.get_all(
+    tasks.shippers, "/get-shippers", schemas.GetShippersResponse,
+    "Get all shippers",
+    dependencies=[etag.conditional(models.Shipper)],
+)
+routes.get_one(
+    tasks.shippers, "/get-shippers/{shipper_id}", schemas.ShipperBase,
+    "Get a shipper",
+)
+routes.add(tasks.shippers, "/add-shipper", int, "Add a shipper")
+routes.update(
+    tasks.shippers, "/update-shipper/{shipper_id}", int, "Update a shipper")
+routes.delete(
+    tasks.shippers, "/delete-shipper/{shipper_id}", int, "Delete a shipper")
+routes.delete_many(
+    tasks.shippers, "/delete-shippers",
+    "Delete many shippers at once\n\nThe body is the list of shipper IDs.",
+)
@@ -2,10 +2,13 @@
 """Seller schemas"""
 from datetime import datetime
 from pydantic import BaseModel
+from pydantic import ConfigDict
 
 
 class ShipperBase(BaseModel):
     """Shipper base schema"""
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     created_at: datetime
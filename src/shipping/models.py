@@ -15,8 +15,8 @@ class ShippingStatus(Base):
     __tablename__ = 'shipping_statuses'
 
     id_status = Column(Integer, primary_key=True)
-    status_name = Column("status_name", String, nullable=False)
-    description = Column("description", String, nullable=False)
+    status_name = Column("status_name", String(50), nullable=False, unique=True)
+    description = Column("description", Text, nullable=False)
 
     # Relationships
     shipping_groups = relationship("ShippingGroup", back_populates="status")
@@ -27,7 +27,7 @@ class ShippingGroup(Base):
     __tablename__ = 'shipping_groups'
 
     id_shipping_group = Column(Integer, primary_key=True, autoincrement=True)
-    shipping_group_name = Column(String(255), nullable=False)
+    shipping_group_name = Column(String(255), nullable=False, unique=True)
     id_shipper = Column(
         Integer, ForeignKey('shippers.id_shipper'), nullable=False)
     id_status = Column(
@@ -36,6 +36,9 @@ class ShippingGroup(Base):
     dollar_price = Column(Numeric(10, 2), nullable=False)
     tax = Column(Numeric(10, 2), nullable=False)
     notes = Column(Text, nullable=True)
+    # Number of products in the group. It is maintained by the product tasks
+    # so the shipping cost per product doesn't need to count the products.
+    product_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Relationships
     shipper = relationship("Shipper", back_populates="shipping_groups")
@@ -1,16 +1,28 @@
 #!/usr/bin/env python
 """This module defines common queries for product management."""
 from sqlalchemy import select
+import reference_cache
 from . import models
 
 
-def get_shipping_group_by_name(session, shipping_group_name):
-    """Get shipping group by name"""
-    db_shipping_group = session.scalar(
+def select_shipping_group_by_name(shipping_group_name):
+    """Select statement of a shipping group by name"""
+    return (
         select(models.ShippingGroup)
         .where(models.ShippingGroup.shipping_group_name == shipping_group_name)
     )
-    if not db_shipping_group:
+
+
+def get_shipping_group_id_by_name(session, shipping_group_name):
+    """Get shipping group ID by name, using the reference cache"""
+    id_shipping_group = reference_cache.get_or_load(
+        models.ShippingGroup.__tablename__,
+        ("name", shipping_group_name),
+        lambda: session.scalar(
+            select_shipping_group_by_name(shipping_group_name)
+            .with_only_columns(models.ShippingGroup.id_shipping_group)),
+    )
+    if id_shipping_group is None:
         raise ValueError(
             f"Shipping group '{shipping_group_name}' not found.")
-    return db_shipping_group
+    return id_shipping_group
@@ -1,63 +1,54 @@
 #!/usr/bin/env python
 """Router for the API for shipping """
 from fastapi import APIRouter
+from dispatch import run_task
+from dispatch import BULK_TIMEOUT
+import crud_router
+import etag
+from schemas import BulkDeleteResponse
+from . import models
 from . import schemas
 from . import tasks
 
 router = APIRouter()
-
-
-@router.get("/get-shipping-statuses")
-async def get_shipping_statuses() -> schemas.GetShippingStatusesResponse:
-    """Get all shipping statuses"""
-    task = tasks.get_shipping_statuses.delay()
-    return task.get()
-
-
-@router.get("/get-shipping-status/{status_id}")
-async def get_shipping_status(status_id: int) -> schemas.ShippingStatusBase:
-    """Get a shipping status"""
-    task = tasks.get_shipping_status.delay(status_id)
-    return task.get()
-
-
-@router.post("/add-shipping-status")
-async def add_shipping_status(name: str, description: str) -> int:
-    """Add a shipping status"""
-    task = tasks.add_shipping_status.delay(name, description)
-    return task.get()
-
-
-@router.put("/update-shipping-status/{status_id}")
-async def update_shipping_status(
-        status_id: int,
-        name: str,
-        description: str,
-) -> int:
-    """Update a shipping status"""
-    task = tasks.update_shipping_status.delay(status_id, name, description)
-    return task.get()
-
-
-@router.delete("/delete-shipping-status/{status_id}")
-async def delete_shipping_status(status_id: int) -> int:
-    """Delete a shipping status"""
-    task = tasks.delete_shipping_status.delay(status_id)
-    return task.get()
-
-
-@router.get("/get-shipping-groups")
-async def get_shipping_groups() -> schemas.GetShippingGroupsResponse:
-    """Get all shipping groups"""
-    task = tasks.get_shipping_groups.delay()
-    return task.get()
-
-
-@router.get("/get-shipping-group/{group_id}")
-async def get_shipping_group(group_id: int) -> schemas.ShippingGroupBase:
-    """Get a shipping group"""
-    task = tasks.get_shipping_group.delay(group_id)
-    return task.get()
+routes = crud_router.Routes(router, __name__)
+routes.get_all(
+    tasks.shipping_statuses, "/get-shipping-statuses",
+    schemas.GetShippingStatusesResponse, "Get all shipping statuses",
+    cache=True,
+    dependencies=[etag.conditional(models.ShippingStatus)],
+)
+routes.get_one(
+    tasks.shipping_statuses, "/get-shipping-status/{status_id}",
+    schemas.ShippingStatusBase, "Get a shipping status",
+)
+routes.add(
+    tasks.shipping_statuses, "/add-shipping-status", int,
+    "Add a shipping status",
+)
+routes.update(
+    tasks.shipping_statuses, "/update-shipping-status/{status_id}", int,
+    "Update a shipping status",
+)
+routes.delete(
+    tasks.shipping_statuses, "/delete-shipping-status/{status_id}", int,
+    "Delete a shipping status",
+)
+routes.delete_many(
+    tasks.shipping_statuses, "/delete-shipping-statuses",
+    "Delete many shipping statuses at once\n\n"
+    "The body is the list of shipping status IDs.",
+)
+routes.get_all(
+    tasks.shipping_groups, "/get-shipping-groups",
+    schemas.GetShippingGroupsResponse, "Get all shipping groups",
+    cache=True,
+    dependencies=[etag.conditional(models.ShippingGroup)],
+)
+routes.get_one(
+    tasks.shipping_groups, "/get-shipping-group/{group_id}",
+    schemas.ShippingGroupBase, "Get a shipping group",
+)
 
 
 @router.post("/add-shipping-group")
@@ -71,10 +62,10 @@ async def add_shipping_group(
         notes: str | None,
 ) -> int:
     """Add a shipping group"""
-    task = tasks.add_shipping_group.delay(
-        name, id_shipper, id_status, shipping_cost, dollar_price, tax, notes
+    return await run_task(
+        tasks.add_shipping_group,
+        name, id_shipper, id_status, shipping_cost, dollar_price, tax, notes,
     )
-    return task.get()
 
 
 @router.put("/update-shipping-group/{group_id}")
@@ -89,7 +80,8 @@ async def update_shipping_group(
         notes: str | None = None,
         ) -> schemas.UpdateShippingGroupResponse:
     """Update a shipping group"""
-    task = tasks.update_shipping_group.delay(
+    return await run_task(
+        tasks.update_shipping_group,
         id_shipping_group=id_shipping_group,
         name=name,
         id_shipper=id_shipper,
@@ -99,11 +91,21 @@ async def update_shipping_group(
         tax=tax,
         notes=notes,
     )
-    return task.get()
 
 
 @router.delete("/delete-shipping-group/{group_id}")
 async def delete_shipping_group(group_id: int) -> int:
     """Delete a shipping group"""
-    task = tasks.delete_shipping_group.delay(group_id)
-    return task.get()
+    return await run_task(tasks.delete_shipping_group, group_id)
+
+
+@router.post("/delete-shipping-groups")
+async def delete_shipping_groups(group_ids: list[int]) -> BulkDeleteResponse:
+    """Delete many shipping groups at once
+
+    The body is the list of shipping group IDs. Their products are kept
+    without a shipping group. The IDs that are not found are returned in
+    `not_found`.
+    """
+    return await run_task(
+        tasks.delete_shipping_groups, group_ids, timeout=BULK_TIMEOUT)
@@ -2,10 +2,13 @@
 """Seller schemas"""
 from datetime import datetime
 from pydantic import BaseModel
+from pydantic import ConfigDict
 
 
 class ShippingStatusBase(BaseModel):
     """Shipper base schema"""
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     description: str
@@ -20,6 +23,8 @@ class GetShippingStatusesResponse(BaseModel):
 
 class ShippingGroupBase(BaseModel):
     """Shipping group base schema"""
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     id_shipper: int
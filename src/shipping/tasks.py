@@ -2,149 +2,58 @@
 """This module contains tasks for the shipping"""
 from celery import shared_task
 from sqlalchemy import select
+from sqlalchemy import update
 from database import Session
+from database import commit_unique
+from database import execute_unique
+import crud
+import reference_cache
+import response_cache
 from shippers.models import Shipper
+from products.models import Product
 from . import models
 from . import schemas
 
 
-@shared_task
-def get_shipping_statuses():
-    """Get shipping statuses from database"""
-    with Session() as session:
-        db_statuses = session.scalars(select(models.ShippingStatus)).all()
-        statuses = [
-            schemas.ShippingStatusBase(
-                id=db_status.id_status,
-                name=db_status.status_name,
-                description=db_status.description,
-                created_at=db_status.created_at,
-                updated_at=db_status.updated_at,
-            ).dict()
-            for db_status in db_statuses
-        ]
-        return schemas.GetShippingStatusesResponse(statuses=statuses).dict()
-
-
-@shared_task
-def get_shipping_status(status_id: int):
-    """Get shipping status from database"""
-    with Session() as session:
-        db_status = session.scalar(
-            select(models.ShippingStatus)
-            .where(models.ShippingStatus.id_status == status_id)
-        )
-        if not db_status:
-            raise ValueError(f"Shipping status with ID {status_id} not found.")
-        return schemas.ShippingStatusBase(
-            id=db_status.id_status,
-            name=db_status.status_name,
-            description=db_status.description,
-            created_at=db_status.created_at,
-            updated_at=db_status.updated_at,
-        ).dict()
-
-
-@shared_task
-def add_shipping_status(name: str, description: str):
-    """Add shipping status to database"""
-    with Session() as session:
-        # Before adding a new shipping status, we should confirm that there is
-        # no shipping status with the same name in the database. This is a
-        # business rule that should be enforced.
-        db_status = session.scalar(
-            select(models.ShippingStatus)
-            .where(models.ShippingStatus.status_name == name)
-        )
-        if db_status:
-            raise ValueError(
-                f"Shipping status '{name}' already exists in the database.")
-
-        new_status = models.ShippingStatus(
-            status_name=name,
-            description=description,
-        )
-        session.add(new_status)
-        session.commit()
-        return new_status.id_status
-
-
-@shared_task
-def update_shipping_status(status_id: int, name: str, description: str):
-    """Update shipping status by status_id"""
-    with Session() as session:
-        db_status = session.scalar(
-            select(models.ShippingStatus)
-            .where(models.ShippingStatus.id_status == status_id)
-        )
-        if not db_status:
-            raise ValueError(f"Shipping status with ID {status_id} not found.")
-        db_status.status_name = name
-        db_status.description = description
-        session.commit()
-        return status_id
-
-
-@shared_task
-def delete_shipping_status(status_id: int):
-    """Delete shipping status by status_id"""
-    with Session() as session:
-        db_status = session.scalar(
-            select(models.ShippingStatus)
-            .where(models.ShippingStatus.id_status == status_id)
-        )
-        if not db_status:
-            raise ValueError(f"Shipping status with ID {status_id} not found.")
-        session.delete(db_status)
-        session.commit()
-        return status_id
-
-
-@shared_task
-def get_shipping_groups():
-    """Get shipping groups from database"""
-    with Session() as session:
-        db_groups = session.scalars(select(models.ShippingGroup)).all()
-        groups = [
-            schemas.ShippingGroupBase(
-                id=db_group.id_shipping_group,
-                name=db_group.shipping_group_name,
-                id_shipper=db_group.id_shipper,
-                id_status=db_group.id_status,
-                shipping_cost=db_group.shipping_cost,
-                dollar_price=db_group.dollar_price,
-                tax=db_group.tax,
-                created_at=db_group.created_at,
-                updated_at=db_group.updated_at,
-                notes=db_group.notes,
-            ).dict()
-            for db_group in db_groups
-        ]
-        return schemas.GetShippingGroupsResponse(groups=groups).dict()
-
-
-@shared_task
-def get_shipping_group(group_id: int):
-    """Get shipping group from database"""
-    with Session() as session:
-        db_group = session.scalar(
-            select(models.ShippingGroup)
-            .where(models.ShippingGroup.id_shipping_group == group_id)
-        )
-        if not db_group:
-            raise ValueError(f"Shipping group with ID {group_id} not found.")
-        return schemas.ShippingGroupBase(
-            id=db_group.id_shipping_group,
-            name=db_group.shipping_group_name,
-            id_shipper=db_group.id_shipper,
-            id_status=db_group.id_status,
-            shipping_cost=db_group.shipping_cost,
-            dollar_price=db_group.dollar_price,
-            tax=db_group.tax,
-            created_at=db_group.created_at,
-            updated_at=db_group.updated_at,
-            notes=db_group.notes,
-        ).dict()
+# The rows of the shipping statuses are read and changed by the generated
+# tasks. The shipping groups have their own tasks to add and update them,
+# which check their shipper and status.
+shipping_statuses = crud.Resource(
+    models.ShippingStatus,
+    schemas.ShippingStatusBase,
+    "Shipping status",
+    __name__,
+    columns={
+        "id": models.ShippingStatus.id_status,
+        "name": models.ShippingStatus.status_name,
+    },
+    fields=("name", "description"),
+    trusted=True,
+)
+get_shipping_statuses = shipping_statuses.get_all_task(
+    "get_shipping_statuses", "statuses")
+get_shipping_status = shipping_statuses.get_one_task("get_shipping_status")
+add_shipping_status = shipping_statuses.add_task("add_shipping_status")
+update_shipping_status = shipping_statuses.update_task(
+    "update_shipping_status")
+delete_shipping_status = shipping_statuses.delete_task(
+    "delete_shipping_status")
+delete_shipping_statuses = shipping_statuses.delete_many_task(
+    "delete_shipping_statuses")
+
+shipping_groups = crud.Resource(
+    models.ShippingGroup,
+    schemas.ShippingGroupBase,
+    "Shipping group",
+    __name__,
+    columns={
+        "id": models.ShippingGroup.id_shipping_group,
+        "name": models.ShippingGroup.shipping_group_name,
+    },
+)
+get_shipping_groups = shipping_groups.get_all_task(
+    "get_shipping_groups", "groups")
+get_shipping_group = shipping_groups.get_one_task("get_shipping_group")
 
 
 @shared_task
@@ -159,28 +68,15 @@ def add_shipping_group(
 ):
     """Add shipping group to database"""
     with Session() as session:
-        # Before adding a new shipping group, we should confirm that there is
-        # no shipping group with the same name in the database. This is a
-        # business rule that should be enforced.
-        db_group = session.scalar(
-            select(models.ShippingGroup)
-            .where(models.ShippingGroup.shipping_group_name == name)
-        )
-        if db_group:
-            raise ValueError(
-                f"Shipping group '{name}' already exists in the database.")
-
-        # Check if the shipper and status exist
-        db_shipper = session.scalar(
-            select(Shipper).where(Shipper.id_shipper == id_shipper)
-        )
-        if not db_shipper:
+        # Check if the shipper and status exist, reading only their IDs
+        if session.scalar(
+            select(Shipper.id_shipper).where(Shipper.id_shipper == id_shipper)
+        ) is None:
             raise ValueError(f"Shipper with ID {id_shipper} not found.")
-        db_status = session.scalar(
-            select(models.ShippingStatus)
+        if session.scalar(
+            select(models.ShippingStatus.id_status)
             .where(models.ShippingStatus.id_status == id_status)
-        )
-        if not db_status:
+        ) is None:
             raise ValueError(f"Shipping status with ID {id_status} not found.")
 
         # Add the new shipping group
@@ -194,7 +90,12 @@ def add_shipping_group(
             notes=notes,
         )
         session.add(new_group)
-        session.commit()
+        commit_unique(
+            session,
+            f"Shipping group '{name}' already exists in the database.",
+        )
+        reference_cache.invalidate(models.ShippingGroup.__tablename__)
+        response_cache.invalidate(models.ShippingGroup.__tablename__)
         return new_group.id_shipping_group
 
 
@@ -212,66 +113,89 @@ def update_shipping_group(
     """Update shipping group by id_shipping_group.
 
     This task updates the shipping group with the given id_shipping_group. All
-    fields are optional, so only the fields that are not None will be updated.
+    fields are optional, so only the fields that are not None will be updated,
+    in a single UPDATE statement without loading the shipping group.
 
     Returns:
         UpdateShippingGroupResponse: The response object with the ID of the
             updated shipping group and the number of changes made.
     """
+    values = {
+        column: value
+        for column, value in (
+            ("shipping_group_name", name),
+            ("id_shipper", id_shipper),
+            ("id_status", id_status),
+            ("shipping_cost", shipping_cost),
+            ("dollar_price", dollar_price),
+            ("tax", tax),
+            ("notes", notes),
+        )
+        if value is not None
+    }
+    if not values:
+        raise ValueError("No changes to update.")
     with Session() as session:
-        db_group = session.scalar(
-            select(models.ShippingGroup)
+        result = execute_unique(
+            session,
+            update(models.ShippingGroup)
             .where(models.ShippingGroup.id_shipping_group == id_shipping_group)
+            .values(**values)
+            .execution_options(synchronize_session=False),
+            f"Shipping group '{name}' already exists in the database.",
         )
-        if not db_group:
+        if not result.rowcount:
             raise ValueError(
                 f"Shipping group with ID {id_shipping_group} not found.")
-
-        num_changes = 0
-        # Update the fields that are not None
-        if name is not None:
-            db_group.shipping_group_name = name
-            num_changes += 1
-        if id_shipper is not None:
-            db_group.id_shipper = id_shipper
-            num_changes += 1
-        if id_status is not None:
-            db_group.id_status = id_status
-            num_changes += 1
-        if shipping_cost is not None:
-            db_group.shipping_cost = shipping_cost
-            num_changes += 1
-        if dollar_price is not None:
-            db_group.dollar_price = dollar_price
-            num_changes += 1
-        if tax is not None:
-            db_group.tax = tax
-            num_changes += 1
-        if notes is not None:
-            db_group.notes = notes
-            num_changes += 1
-
-        if not num_changes:
-            raise ValueError("No changes to update.")
-
         session.commit()
+        reference_cache.invalidate(models.ShippingGroup.__tablename__)
+        response_cache.invalidate(models.ShippingGroup.__tablename__)
         return schemas.UpdateShippingGroupResponse(
             id=id_shipping_group,
-            num_changes=num_changes,
-        ).dict()
+            num_changes=len(values),
+        ).model_dump()
+
+
+def _remove_products(session, group_ids: list[int]):
+    """Keep the products of the shipping groups without a shipping group
+
+    This must be called in the same transaction that deletes the groups,
+    and before it.
+    """
+    session.execute(
+        update(Product)
+        .where(Product.id_shipping_group.in_(group_ids))
+        .values(id_shipping_group=None)
+        .execution_options(synchronize_session=False)
+    )
 
 
 @shared_task
 def delete_shipping_group(id_shipping_group: int):
     """Delete shipping group by id_shipping_group"""
     with Session() as session:
-        db_group = session.scalar(
-            select(models.ShippingGroup)
-            .where(models.ShippingGroup.id_shipping_group == id_shipping_group)
-        )
-        if not db_group:
-            raise ValueError(
-                f"Shipping group with ID {id_shipping_group} not found.")
-        session.delete(db_group)
+        _remove_products(session, [id_shipping_group])
+        crud.delete_by_id(
+            session, models.ShippingGroup, id_shipping_group, "Shipping group")
         session.commit()
+        reference_cache.invalidate(models.ShippingGroup.__tablename__)
+        response_cache.invalidate(models.ShippingGroup.__tablename__)
         return id_shipping_group
+
+
+@shared_task
+def delete_shipping_groups(group_ids: list[int]):
+    """Delete many shipping groups by their IDs
+
+    Their products are kept without a shipping group. The groups that are
+    found are deleted in a single DELETE statement, and the IDs that are
+    not found are reported in the response.
+    """
+    with Session() as session:
+        _remove_products(session, group_ids)
+        response = crud.delete_by_ids(
+            session, models.ShippingGroup, group_ids)
+        session.commit()
+        reference_cache.invalidate(models.ShippingGroup.__tablename__)
+        response_cache.invalidate(models.ShippingGroup.__tablename__)
+        return response.model_dump()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""State changes of the Celery tasks, pushed to the API as they happen.
+
+The Redis result backend publishes every state it stores (STARTED,
+custom progress states and the final result) on a channel named like the
+result key of the task. `TaskStateHub` subscribes to the channels of the
+watched tasks over a single Redis connection per API process, and fans
+out every message to the watchers of that task.
+"""
+import asyncio
+import logging
+import contextlib
+from collections import defaultdict
+import redis
+import redis.asyncio
+from celery import states
+from celery_worker import REDIS_URL
+from celery_worker import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+class TaskStateHub:
+    """Shared subscriber to the state changes of the watched tasks.
+
+    Every watcher gets a queue with the task metadata of each state stored
+    by the backend. If the connection to Redis is lost, None is put in all
+    the queues, so the watchers read the current state again.
+    """
+
+    def __init__(self, url: str = REDIS_URL):
+        self._url = url
+        self._redis = None
+        self._pubsub = None
+        self._reader = None
+        self._queues: dict[str, set[asyncio.Queue]] = defaultdict(set)
+
+    @staticmethod
+    def _channel(task_id: str) -> str:
+        return celery_app.backend.get_key_for_task(task_id).decode()
+
+    async def _subscribe(self, channel: str):
+        if self._pubsub is None:
+            self._connect()
+            self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(channel)
+        # The reader is started after the first subscription, since the
+        # pubsub connection is opened by it
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read_messages())
+
+    async def _read_messages(self):
+        """Dispatch the published states to the queues of their task."""
+        while True:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=1.0,
+                )
+            except redis.RedisError as exc:
+                logger.warning("Task state subscriber disconnected: %s", exc)
+                # States could have been missed while disconnected
+                for queues in self._queues.values():
+                    for queue in queues:
+                        queue.put_nowait(None)
+                await asyncio.sleep(1)
+                continue
+            if message is None or message["type"] != "message":
+                continue
+            channel = message["channel"].decode()
+            queues = self._queues.get(channel)
+            if not queues:
+                continue
+            meta = celery_app.backend.decode_result(message["data"])
+            for queue in queues:
+                queue.put_nowait(meta)
+
+    @contextlib.asynccontextmanager
+    async def watch(self, *task_ids: str):
+        """Context manager that yields a queue with the states of the tasks.
+
+        The metadata put in the queue has the `task_id` of its task.
+        """
+        channels = {self._channel(task_id) for task_id in task_ids}
+        queue = asyncio.Queue()
+        for channel in channels:
+            if not self._queues[channel]:
+                await self._subscribe(channel)
+            self._queues[channel].add(queue)
+        try:
+            yield queue
+        finally:
+            for channel in channels:
+                self._queues[channel].discard(queue)
+                if not self._queues[channel]:
+                    del self._queues[channel]
+                    with contextlib.suppress(redis.RedisError):
+                        await self._pubsub.unsubscribe(channel)
+
+    def _connect(self):
+        if self._redis is None:
+            self._redis = redis.asyncio.Redis.from_url(self._url)
+
+    async def get_task_meta(self, task_id: str) -> dict:
+        """Read the current metadata of a task from the result backend."""
+        return (await self.get_task_metas([task_id]))[task_id]
+
+    async def get_task_metas(self, task_ids: list[str]) -> dict[str, dict]:
+        """Read the current metadata of many tasks with a single MGET."""
+        self._connect()
+        values = await self._redis.mget(
+            [self._channel(task_id) for task_id in task_ids]
+        )
+        return {
+            task_id: (
+                celery_app.backend.decode_result(data) if data
+                else {"status": states.PENDING, "result": None}
+            )
+            for task_id, data in zip(task_ids, values)
+        }
+
+
+# Hub of this API process
+hub = TaskStateHub()
+
+
+def _get_result(meta: dict):
+    """Return the result of task metadata, as it is sent to the clients."""
+    if meta["status"] in states.EXCEPTION_STATES:
+        return str(meta["result"])
+    return meta["result"]
+
+
+def as_message(task_id: str, meta: dict) -> dict:
+    """Convert task metadata to the message sent to the clients."""
+    return {"task_id": task_id, "state": meta["status"], "result": _get_result(meta)}
+
+
+async def follow_task(task_id: str):
+    """Yield the messages of every state of a task, until it is ready.
+
+    The first message has the current state of the task.
+    """
+    async with hub.watch(task_id) as updates:
+        # The task could have changed its state before the subscription
+        meta = await hub.get_task_meta(task_id)
+        while True:
+            yield as_message(task_id, meta)
+            if meta["status"] in states.READY_STATES:
+                return
+            meta = await updates.get()
+            if meta is None:
+                meta = await hub.get_task_meta(task_id)
+
+
+async def get_task_states(
+        task_ids: list[str],
+        known_states: dict[str, str] | None = None,
+        wait: float = 0,
+        ) -> dict[str, dict]:
+    """Return the state and result of many tasks.
+
+    With `wait`, if no task has a state different from `known_states`
+    (the states the client already has), wait up to `wait` seconds until
+    any of them changes. There is no wait if all the tasks are ready.
+
+    Returns:
+        dict: The state and result of every task, by task ID.
+    """
+    known_states = known_states or {}
+    updates = None
+    async with contextlib.AsyncExitStack() as stack:
+        if wait > 0:
+            # Subscribe before reading, so no change can be missed
+            updates = await stack.enter_async_context(hub.watch(*task_ids))
+        metas = await hub.get_task_metas(task_ids)
+        changed = any(
+            task_id in known_states and meta["status"] != known_states[task_id]
+            for task_id, meta in metas.items()
+        )
+        running = any(
+            meta["status"] not in states.READY_STATES
+            for meta in metas.values()
+        )
+        if updates is not None and running and not changed:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(updates.get(), timeout=wait)
+                metas = await hub.get_task_metas(task_ids)
+    return {
+        task_id: {"state": meta["status"], "result": _get_result(meta)}
+        for task_id, meta in metas.items()
+    }
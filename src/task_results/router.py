@@ -0,0 +1,25 @@
+#!/usr/bin/env python
+"""Router for the API for task results"""
+from fastapi import APIRouter
+import task_events
+from . import schemas
+
+router = APIRouter()
+
+
+@router.post("/get-states")
+async def get_task_states(
+        request: schemas.GetTaskStatesRequest,
+        ) -> schemas.GetTaskStatesResponse:
+    """Get the state and result of many tasks at once
+
+    All the states are read from the result backend with a single command.
+    With `wait`, the request is held until any task changes its state from
+    `known_states`, or until `wait` seconds have passed.
+    """
+    tasks = await task_events.get_task_states(
+        list(dict.fromkeys(request.task_ids)),
+        known_states=request.known_states,
+        wait=request.wait,
+    )
+    return schemas.GetTaskStatesResponse(tasks=tasks)
@@ -0,0 +1,29 @@
+#!/usr/bin/python3
+"""Task results schemas"""
+from typing import Any
+from pydantic import BaseModel
+from pydantic import Field
+
+# Limits of a single request
+MAX_TASK_IDS = 1000
+MAX_WAIT = 30
+
+
+class GetTaskStatesRequest(BaseModel):
+    """Get task states request schema"""
+    task_ids: list[str] = Field(min_length=1, max_length=MAX_TASK_IDS)
+    # States the client already has, by task ID
+    known_states: dict[str, str] = {}
+    # Seconds to wait for a change if no task changed from known_states
+    wait: float = Field(default=0, ge=0, le=MAX_WAIT)
+
+
+class TaskState(BaseModel):
+    """Task state schema"""
+    state: str
+    result: Any = None
+
+
+class GetTaskStatesResponse(BaseModel):
+    """Get task states response schema"""
+    tasks: dict[str, TaskState]